@@ -0,0 +1,320 @@
+"""
+Derived-artifact cache - scored frames, rank tables, sort orders, radar baselines and map HTML
+Artifacts are keyed by type, dataset fingerprint, normalization bounds and weights,
+and looked up through a stack of tiers: an in-process LRU shared by every session,
+then the local disk shared by every process on the host (replicas, the precompute
+job). Hits are copied up into the faster tiers; misses are built once and written
+to all of them. Any object with get/put can be stacked in as a further tier
+
+Both built-in tiers are bounded in bytes: every weight combination is a new scored
+frame and base map, so without a budget slider traffic would grow them without end
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from interpretation import add_label_columns
+from mapping import render_base_map
+from scoring import RANKED_METRICS, SCORE_COLUMNS, apply_weights, calculate_sub_scores, top_k
+
+ARTIFACT_DIR = os.path.join('.cache', 'artifacts')
+
+# Bump when the scoring, labels or map output change shape
+ARTIFACT_VERSION = 3
+
+# Artifacts kept in memory per process, least recently used evicted first
+MEMORY_ENTRIES = int(os.environ.get('LIVABILITY_ARTIFACT_MEMORY_ENTRIES', 64))
+MEMORY_BYTES = int(os.environ.get('LIVABILITY_ARTIFACT_MEMORY_MB', 256)) << 20
+
+# Artifact files kept on disk, shared by every process; the least recently used
+# are deleted once the directory outgrows the budget, down to DISK_EVICT_TO of it
+DISK_BYTES = int(os.environ.get('LIVABILITY_ARTIFACT_DISK_MB', 1024)) << 20
+DISK_EVICT_TO = 0.8
+
+
+def _encode(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot key an artifact on {type(value).__name__}")
+
+
+def artifact_key(kind, *parts):
+    """Stable digest of an artifact's type and the values it depends on."""
+    encoded = json.dumps([ARTIFACT_VERSION, kind, *parts], default=_encode, sort_keys=True)
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+def score_version(fingerprint, bounds=None):
+    """Identifies a set of sub-scores: the data, plus the bounds under global normalization."""
+    return fingerprint if bounds is None else f"{fingerprint}-{artifact_key('bounds', bounds)[:16]}"
+
+
+def artifact_size(value):
+    """Approximate bytes held by an artifact."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(artifact_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(artifact_size(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class MemoryTier:
+    """Process-wide LRU; values are shared between sessions and must not be mutated."""
+
+    def __init__(self, max_entries=MEMORY_ENTRIES, max_bytes=MEMORY_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.used = 0
+        # Streamlit runs each session's script in its own thread
+        self.lock = threading.Lock()
+
+    def get(self, kind, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, kind, key, value):
+        size = artifact_size(value)
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit; the caller keeps its copy
+            return
+        with self.lock:
+            self.used += size - self.sizes.get(key, 0)
+            self.entries[key] = value
+            self.sizes[key] = size
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries or self.used > self.max_bytes:
+                old_key, _ = self.entries.popitem(last=False)
+                self.used -= self.sizes.pop(old_key)
+
+
+class DiskTier:
+    """Frames as Feather, arrays as .npy and the rest as JSON under root/<kind>/<key>, written atomically.
+
+    Files are evicted least recently used first (by modification time, which a hit
+    refreshes) once they add up to more than max_bytes; None disables eviction.
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, max_bytes=DISK_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        # Bytes on disk as last scanned plus what this process wrote since; other
+        # processes' writes show up at the next scan, which every eviction starts with
+        self.used = None
+        self.lock = threading.Lock()
+
+    def path(self, kind, key, ext):
+        return os.path.join(self.root, kind, key + ext)
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            # Read-only directories still serve their files
+            pass
+
+    def _read(self, kind, key):
+        path = self.path(kind, key, '.feather')
+        try:
+            # Memory-mapped like the data snapshots: numeric columns stay in the
+            # page cache, shared with every other replica reading the same file
+            table = feather.read_table(path, memory_map=True)
+            return path, table.to_pandas(split_blocks=True)
+        except (OSError, pa.ArrowException):
+            pass
+        path = self.path(kind, key, '.npy')
+        try:
+            return path, np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            pass
+        path = self.path(kind, key, '.json')
+        try:
+            with open(path) as f:
+                return path, json.load(f)
+        except (OSError, ValueError):
+            return None, None
+
+    def get(self, kind, key):
+        path, value = self._read(kind, key)
+        if value is not None and self.max_bytes is not None:
+            self._touch(path)
+        return value
+
+    def files(self):
+        """(modification time, size, path) of every artifact file."""
+        found = []
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith('.tmp'):
+                    # Another process's write in progress
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # Evicted or swapped in by another process meanwhile
+                    continue
+                found.append((stat.st_mtime_ns, stat.st_size, path))
+        return found
+
+    def evict(self, target_bytes):
+        """Delete the least recently used files until at most target_bytes remain; returns bytes left."""
+        files = sorted(self.files())
+        used = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if used <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            used -= size
+        return used
+
+    def _account(self, size):
+        with self.lock:
+            self.used = sum(size for _, size, _ in self.files()) if self.used is None else self.used + size
+            if self.used > self.max_bytes:
+                self.used = self.evict(self.max_bytes * DISK_EVICT_TO)
+
+    def put(self, kind, key, value):
+        is_frame = isinstance(value, pd.DataFrame)
+        is_array = isinstance(value, np.ndarray)
+        path = self.path(kind, key, '.feather' if is_frame else '.npy' if is_array else '.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Several processes may build the same artifact; each writes its own temp file
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            if is_frame:
+                feather.write_feather(value, tmp_path, compression='uncompressed')
+            elif is_array:
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, value)
+            else:
+                with open(tmp_path, 'w') as f:
+                    json.dump(value, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if self.max_bytes is not None:
+            self._account(os.path.getsize(path))
+
+
+class ArtifactCache:
+    def __init__(self, tiers):
+        self.tiers = list(tiers)
+
+    def _fill(self, tiers, kind, key, value):
+        for tier in tiers:
+            try:
+                tier.put(kind, key, value)
+            except OSError:
+                # A read-only tier still serves what it has
+                pass
+
+    def get(self, kind, key):
+        for i, tier in enumerate(self.tiers):
+            value = tier.get(kind, key)
+            if value is not None:
+                self._fill(self.tiers[:i], kind, key, value)
+                return value
+        return None
+
+    def get_or_build(self, kind, parts, build):
+        key = artifact_key(kind, *parts)
+        value = self.get(kind, key)
+        if value is None:
+            value = build()
+            self._fill(self.tiers, kind, key, value)
+        return value
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """The process-wide memory + disk cache the dashboard uses."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ArtifactCache([MemoryTier(), DiskTier()])
+        return _default_cache
+
+
+def set_default_cache(cache):
+    """Swap in another tier stack, e.g. one ending in a shared network store."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
+
+
+def sub_scores(df, version, bounds=None, cache=None):
+    """Sub-scores with their ranks and labels - the weight-independent part of scoring."""
+    return (cache or default_cache()).get_or_build('sub_scores', [version], lambda: add_label_columns(
+        calculate_sub_scores(df, bounds), RANKED_METRICS + SCORE_COLUMNS))
+
+
+def scored_frame(sub, version, weights, cache=None):
+    """The weighted composite, its rank and its labels on top of the sub-scores."""
+    return (cache or default_cache()).get_or_build('scored', [version, weights], lambda: add_label_columns(
+        apply_weights(sub, weights), ['livability_score']))
+
+
+def radar_baseline(sub, version, cache=None):
+    """Region average of every sub-score, the comparison trace on the radar chart."""
+    return (cache or default_cache()).get_or_build('radar_baseline', [version], lambda: {
+        col: float(sub[col].mean()) for col in SCORE_COLUMNS})
+
+
+def rank_table(scored, version, weights, k=10, largest=True, cache=None):
+    """Top (or bottom) k zips by livability as a Rank/Zip/City/Score display table."""
+    def build():
+        positions = top_k(scored['livability_score'], k, largest)
+        n = len(scored)
+        table = scored.iloc[positions][['zip_code', 'city', 'livability_score']]
+        return pd.DataFrame({
+            'Rank': np.arange(1, len(positions) + 1) if largest
+                    else np.arange(n, n - len(positions), -1),
+            'Zip': table['zip_code'].to_numpy(),
+            'City': table['city'].to_numpy(),
+            'Score': table['livability_score'].astype(np.float64).round(1).to_numpy(),
+        })
+    return (cache or default_cache()).get_or_build('rank_table', [version, weights, k, largest], build)
+
+
+def sort_order(scored, version, weights, column='livability_score', descending=True, cache=None):
+    """Row positions ordered by one score column, best first (or worst); ties keep row order."""
+    def build():
+        values = scored[column].to_numpy()
+        return np.argsort(-values if descending else values, kind='stable')
+    # Only the composite depends on the weights
+    parts = [version, weights if column == 'livability_score' else None, column, descending]
+    return (cache or default_cache()).get_or_build('sort_order', parts, build)
+
+
+def base_map(scored, version, weights, cluster=False, cache=None):
+    """Base map HTML and its Leaflet variable name (see mapping.render_base_map)."""
+    html, map_name = (cache or default_cache()).get_or_build(
+        'base_map', [version, weights, cluster], lambda: list(render_base_map(scored, cluster=cluster)))
+    return html, map_name
@@ -0,0 +1,66 @@
+"""
+Artifact cache benchmark - cold build vs warm disk tier vs warm memory tier
+A fresh MemoryTier over an already filled disk tier is what a second replica, or a
+restarted one, sees on its first request
+
+Usage: python -m benchmarks.bench_artifacts [--rows 57 10000 33000]
+"""
+
+import argparse
+import tempfile
+import time
+import warnings
+
+from artifacts import (ArtifactCache, DiskTier, MemoryTier, base_map, radar_baseline, rank_table,
+                       score_version, scored_frame, sub_scores)
+from benchmarks.synthetic import make_dataset
+from scoring import DEFAULT_WEIGHTS, data_fingerprint
+
+
+def build_all(df, version, cache):
+    """Every artifact the dashboard asks for on a first visit, with per-kind timings."""
+    timings = {}
+
+    def timed(kind, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, cache=cache, **kwargs)
+        timings[kind] = time.perf_counter() - start
+        return result
+
+    sub = timed('sub_scores', sub_scores, df, version)
+    scored = timed('scored', scored_frame, sub, version, DEFAULT_WEIGHTS)
+    timed('radar_baseline', radar_baseline, sub, version)
+    timed('rank_table', rank_table, scored, version, DEFAULT_WEIGHTS)
+    timed('base_map', base_map, scored, version, DEFAULT_WEIGHTS)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[57, 10000, 33000])
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    for n_rows in args.rows:
+        df = make_dataset(n_rows)
+        version = score_version(data_fingerprint(df))
+        with tempfile.TemporaryDirectory() as tmp:
+            disk = DiskTier(tmp)
+            memory = MemoryTier()
+            runs = {
+                'cold': build_all(df, version, ArtifactCache([memory, disk])),
+                'memory hit': build_all(df, version, ArtifactCache([memory, disk])),
+                'disk hit': build_all(df, version, ArtifactCache([MemoryTier(), disk])),
+            }
+
+        print(f"\n{n_rows} rows (ms)")
+        print(f"  {'artifact':<16}" + ''.join(f"{name:>12}" for name in runs))
+        for kind in runs['cold']:
+            print(f"  {kind:<16}" + ''.join(f"{run[kind] * 1000:>12.2f}" for run in runs.values()))
+        print(f"  {'total':<16}" + ''.join(f"{sum(run.values()) * 1000:>12.2f}"
+                                           for run in runs.values()))
+
+
+if __name__ == '__main__':
+    main()
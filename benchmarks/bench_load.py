@@ -0,0 +1,76 @@
+"""
+Cold-start load benchmark - legacy CSV parsing vs typed CSV vs memory-mapped snapshot
+Each measurement runs in a fresh interpreter so nothing is warm in-process
+
+Usage: python -m benchmarks.bench_load [--rows 57 33000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADERS = {
+    'legacy csv': "df = pd.read_csv(path); df['zip_code'] = df['zip_code'].astype(str)",
+    'typed csv': "df = datastore.read_csv(path)",
+    'snapshot': "df = datastore.load_dataset(path, snapshot_dir)",
+}
+
+CHILD = """
+import json, os, resource, sys, time
+import pandas as pd
+import datastore
+
+def rss_kb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+path, snapshot_dir = sys.argv[1], sys.argv[2]
+rss_before = rss_kb()
+start = time.perf_counter()
+{loader}
+seconds = time.perf_counter() - start
+rss_after = rss_kb()
+print(json.dumps({{'seconds': seconds, 'rss_kb': rss_after - rss_before,
+                  'frame_kb': int(df.memory_usage(deep=True).sum()) // 1024}}))
+"""
+
+
+def run_loader(loader, path, snapshot_dir):
+    out = subprocess.run([sys.executable, '-c', CHILD.format(loader=loader), path, snapshot_dir],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[57, 33000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'path':<12} {'load ms':>9} {'RSS +MB':>13} {'frame MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = write_dataset(os.path.join(tmp, f'zips_{n_rows}.csv'), n_rows)
+            snapshot_dir = os.path.join(tmp, 'snapshots')
+            # Build the snapshot once so the snapshot rows measure the warm fast path
+            run_loader(LOADERS['snapshot'], path, snapshot_dir)
+
+            for name, loader in LOADERS.items():
+                runs = [run_loader(loader, path, snapshot_dir) for _ in range(args.repeat)]
+                best = min(runs, key=lambda r: r['seconds'])
+                print(f"{n_rows:>8}  {name:<12} {best['seconds'] * 1000:>9.1f} "
+                      f"{best['rss_kb'] / 1024:>13.1f} {best['frame_kb'] / 1024:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
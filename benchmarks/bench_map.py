@@ -0,0 +1,46 @@
+"""
+Map payload benchmark - per-marker Folium rendering vs the GeoJSON layer
+Reports base-map build+render time and the HTML bytes sent to the browser
+
+Usage: python -m benchmarks.bench_map [--rows 57 1000 10000 33000]
+"""
+
+import argparse
+import time
+import warnings
+
+from benchmarks.synthetic import make_scored_dataset
+from mapping import render_base_map
+
+MODES = [
+    ('markers', dict(mode='markers')),
+    ('geojson', dict(mode='geojson')),
+    ('geojson+cluster', dict(mode='geojson', cluster=True)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[57, 1000, 10000, 33000])
+    parser.add_argument('--max-marker-rows', type=int, default=33000,
+                        help="skip the per-marker path above this many rows")
+    args = parser.parse_args()
+
+    # Folium warns about the CartoDB tile key on every map
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    print(f"{'rows':>8}  {'mode':<16} {'render s':>9} {'payload MB':>11} {'bytes/zip':>10}")
+    for n_rows in args.rows:
+        df = make_scored_dataset(n_rows)
+        for name, options in MODES:
+            if name == 'markers' and n_rows > args.max_marker_rows:
+                continue
+            start = time.perf_counter()
+            html, _ = render_base_map(df, **options)
+            seconds = time.perf_counter() - start
+            size = len(html.encode())
+            print(f"{n_rows:>8}  {name:<16} {seconds:>9.3f} {size / 1e6:>11.2f} {size / n_rows:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
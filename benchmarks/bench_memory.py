@@ -0,0 +1,89 @@
+"""
+Memory report - frame sizes and process RSS for loading and scoring one region
+Each size runs in a fresh interpreter: the raw frame, the sub-scored and scored
+frames the artifact cache holds, and a scored frame read back from the disk tier
+
+Usage: python -m benchmarks.bench_memory [--rows 57 33000 100000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, os, sys, warnings
+warnings.filterwarnings('ignore')
+from artifacts import ArtifactCache, DiskTier, MemoryTier, score_version, scored_frame, sub_scores
+from datastore import load_dataset
+from scoring import DEFAULT_WEIGHTS, data_fingerprint
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+path, tmp_dir = sys.argv[1], sys.argv[2]
+report = {}
+start = rss_mb()
+df = load_dataset(path, os.path.join(tmp_dir, 'snapshots'))
+report['raw'] = (frame_mb(df), rss_mb() - start)
+
+version = score_version(data_fingerprint(df))
+disk = DiskTier(os.path.join(tmp_dir, 'artifacts'))
+cache = ArtifactCache([MemoryTier(), disk])
+before = rss_mb()
+sub = sub_scores(df, version, cache=cache)
+report['sub_scores'] = (frame_mb(sub), rss_mb() - before)
+before = rss_mb()
+scored = scored_frame(sub, version, DEFAULT_WEIGHTS, cache=cache)
+report['scored'] = (frame_mb(scored), rss_mb() - before)
+
+before = rss_mb()
+from_disk = scored_frame(sub, version, DEFAULT_WEIGHTS, cache=ArtifactCache([disk]))
+report['scored from disk'] = (frame_mb(from_disk), rss_mb() - before)
+report['bytes/row'] = (scored.memory_usage(deep=True).sum() / len(scored), None)
+report['total rss'] = (None, rss_mb() - start)
+print(json.dumps(report))
+"""
+
+
+def run_child(path, tmp_dir):
+    # Prime the snapshot first, so the measured load is the memory-mapped one
+    subprocess.run([sys.executable, '-c', f"import datastore; datastore.load_dataset({path!r}, "
+                    f"{os.path.join(tmp_dir, 'snapshots')!r})"], cwd=ROOT, check=True)
+    out = subprocess.run([sys.executable, '-c', CHILD, path, tmp_dir],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def fmt(value, spec):
+    return f"{value:{spec}}" if value is not None else f"{'-':>{spec.split('.')[0]}}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[57, 33000, 100000])
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = write_dataset(os.path.join(tmp_dir, f'zips_{n_rows}.csv'), n_rows)
+            report = run_child(path, tmp_dir)
+
+        print(f"\n{n_rows} rows")
+        print(f"  {'':<18} {'frame MB':>10} {'+RSS MB':>10}")
+        for name, (frame, rss) in report.items():
+            print(f"  {name:<18} {fmt(frame, '10.2f')} {fmt(rss, '10.2f')}")
+
+
+if __name__ == '__main__':
+    main()
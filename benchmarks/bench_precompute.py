@@ -0,0 +1,54 @@
+"""
+Precompute benchmark - region throughput of the warm-up job against worker count
+Writes synthetic regions to a temporary regions/ directory and runs precompute.py's
+pool with a cold snapshot and artifact cache for every worker count
+
+Usage: python -m benchmarks.bench_precompute [--regions 16] [--rows 5000] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import warnings
+
+from benchmarks.bench_views import working_directory
+from benchmarks.synthetic import write_dataset
+from precompute import precompute
+from regions import REGION_DIR, discover_regions
+from scoring import DEFAULT_WEIGHTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--regions', type=int, default=16)
+    parser.add_argument('--rows', type=int, default=5000, help="rows per region")
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count()}))
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    with tempfile.TemporaryDirectory() as tmp, working_directory(tmp):
+        os.makedirs(REGION_DIR)
+        for i in range(args.regions):
+            write_dataset(os.path.join(REGION_DIR, f'region-{i:03d}.csv'), args.rows, seed=i)
+        regions = discover_regions()
+
+        print(f"{args.regions} regions x {args.rows} rows, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>9} {'regions/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            shutil.rmtree('.cache', ignore_errors=True)
+            start = time.perf_counter()
+            for _ in precompute(regions, DEFAULT_WEIGHTS, workers=workers):
+                pass
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{workers:>8} {seconds:>9.2f} {args.regions / seconds:>10.2f} "
+                  f"{baseline / seconds:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
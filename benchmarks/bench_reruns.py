@@ -0,0 +1,110 @@
+"""
+Rerun-cost benchmark - full script reruns vs fragment-scoped reruns per widget
+AppTest always reruns the whole script, so st.fragment is wrapped to time each
+fragment body; that body is all a fragment-scoped rerun executes in the browser
+
+Usage: python -m benchmarks.bench_reruns [--rows 57 10000] [--repeat 5]
+"""
+
+import argparse
+import functools
+import logging
+import os
+import statistics
+import tempfile
+import time
+import warnings
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_views import SCRIPT, timed_run, working_directory
+from benchmarks.synthetic import write_dataset
+from datastore import DATA_FILE
+
+fragment_seconds = {}
+_st_fragment = st.fragment
+
+
+def timed_fragment(func=None, **kwargs):
+    if func is None:
+        return lambda f: timed_fragment(f, **kwargs)
+
+    @functools.wraps(func)
+    def timed(*args, **kw):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kw)
+        finally:
+            fragment_seconds[func.__name__] = time.perf_counter() - start
+
+    return _st_fragment(timed, **kwargs)
+
+
+def set_city(at, i):
+    box = at.sidebar.selectbox(key='city_selector')
+    box.select(box.options[1 + i % (len(box.options) - 1)])
+
+
+def set_comparison(at, i):
+    box = at.multiselect[0]
+    box.set_value([box.options[i % len(box.options)]])
+
+
+def set_nearby_count(at, i):
+    at.slider(key='nearby_count').set_value(3 + i % 6)
+
+
+# (widget, tab to open, fragment that owns the widget, interaction)
+INTERACTIONS = [
+    ('city filter', "📊 Detailed Analysis", 'render_zip_selector', set_city),
+    ('comparison set', "📈 Comparisons", 'render_comparisons', set_comparison),
+    ('nearby count', "🗺️ Map View", 'render_nearby', set_nearby_count),
+]
+
+
+def bench_reruns(repeat):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(SCRIPT, default_timeout=600)
+    timed_run(at)
+
+    results = {}
+    for name, tab, fragment, interact in INTERACTIONS:
+        at.session_state['main_tabs'] = tab
+        timed_run(at)
+        full, partial = [], []
+        for i in range(repeat + 1):
+            interact(at, i)
+            seconds = timed_run(at)
+            if i:  # the first pass warms that widget's caches
+                full.append(seconds)
+                partial.append(fragment_seconds[fragment])
+        results[name] = statistics.median(full), statistics.median(partial)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[57, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+    st.fragment = timed_fragment
+
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp, working_directory(tmp):
+            write_dataset(os.path.join(tmp, DATA_FILE), n_rows)
+            results = bench_reruns(args.repeat)
+
+        print(f"\n{n_rows} rows")
+        print(f"  {'widget':<16} {'full rerun ms':>14} {'fragment ms':>12} {'saved':>7}")
+        for name, (full, partial) in results.items():
+            print(f"  {name:<16} {full * 1000:>14.1f} {partial * 1000:>12.1f} "
+                  f"{1 - partial / full:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Zip search benchmark - index build and per-query latency against the targets
+Compares the indexed search with a linear scan over every label, and the option
+payload the picker sends with and without the MAX_OPTIONS cap
+
+Usage: python -m benchmarks.bench_search [--rows 33000 100000]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_scored_dataset
+from selection import MAX_OPTIONS, ZipOptions, ZipSearchIndex
+
+BUILD_TARGET_S = 1.0
+QUERY_TARGET_MS = 10.0
+
+QUERIES = ['0', '01', '018', '0185', '01851', '9', '1234',
+           'l', 'low', 'lowell', 'hanscom a', 'afb', 'wellesley 12',
+           'cambrige', 'ville', 'xyz']
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def indexed_query(options, query):
+    return options.zip_options(options.search(query))
+
+
+def scan_query(labels, scores, query):
+    # Substring match over every label, then a sort of the hits
+    hits = labels[labels.str.contains(query, case=False, regex=False)]
+    return hits.iloc[np.argsort(-scores[hits.index], kind='stable')[:MAX_OPTIONS]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[33000, 100000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        df = make_scored_dataset(n_rows)
+        index, index_s = timed(ZipSearchIndex, df)
+        options, options_s = timed(ZipOptions, df, index)
+        labels = pd.Series(index.labels)
+        scores = df['livability_score'].to_numpy()
+
+        indexed, scanned = [], []
+        for query in QUERIES:
+            indexed.append(min(timed(indexed_query, options, query)[1] for _ in range(args.repeat)))
+            scanned.append(min(timed(scan_query, labels, scores, query)[1] for _ in range(3)))
+        indexed_ms = np.array(indexed) * 1000
+        scanned_ms = np.array(scanned) * 1000
+
+        full_kb = len(json.dumps(index.labels.tolist())) / 1024
+        capped_kb = len(json.dumps(options.ranked[:MAX_OPTIONS].tolist())) / 1024
+
+        print(f"\n{n_rows} zips, {len(index.cities)} cities")
+        print(f"  index build       {index_s:8.3f} s   (target < {BUILD_TARGET_S} s) "
+              f"{'ok' if index_s < BUILD_TARGET_S else 'MISSED'}")
+        print(f"  score order       {options_s:8.3f} s   (per weight set)")
+        print(f"  query p50 / max   {statistics.median(indexed_ms):8.2f} / {indexed_ms.max():.2f} ms "
+              f"(target < {QUERY_TARGET_MS} ms) "
+              f"{'ok' if indexed_ms.max() < QUERY_TARGET_MS else 'MISSED'}")
+        print(f"  linear scan p50   {statistics.median(scanned_ms):8.2f} ms")
+        print(f"  options payload   {capped_kb:8.1f} KB  (all labels: {full_kb:.1f} KB)")
+        print(f"  {'query':<14} {'matches':>8} {'indexed ms':>11} {'scan ms':>9}")
+        for query, ms, scan_ms in zip(QUERIES, indexed_ms, scanned_ms):
+            _, n_matches = indexed_query(options, query)
+            print(f"  {query!r:<14} {n_matches:>8} {ms:>11.2f} {scan_ms:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
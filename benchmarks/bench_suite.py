@@ -0,0 +1,331 @@
+"""
+Hot-path benchmark suite - what a dashboard visit costs, at fixed synthetic sizes
+Datasets come from fixed seeds and every result records the commit, library
+versions and machine it ran on, so runs are reproducible and comparable across
+commits: save one with --output, then pass it to --compare on a later run
+
+Usage: python -m benchmarks.bench_suite [--rows 57 1000 10000 33000 100000]
+                                        [--cases load_csv map_build ...]
+                                        [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import folium
+import numpy as np
+import pandas as pd
+import plotly
+import scipy
+
+from artifacts import ArtifactCache, rank_table, score_version, sort_order
+from benchmarks.synthetic import make_dataset
+from charts import comparison_figure, comparison_table, radar_figure
+from datastore import build_snapshot, load_dataset, read_csv
+from export import EXPORT_FORMATS, export_bytes
+from interpretation import add_label_columns
+from leaderboard import leaderboard_page, page_of
+from mapping import add_selection_overlay, render_base_map
+from query import QueryEngine, SimilarityIndex
+from scoring import (DEFAULT_WEIGHTS, RANKED_METRICS, SCORE_COLUMNS, add_rank_columns,
+                     calculate_scores, data_fingerprint)
+from selection import ZipOptions, ZipSearchIndex
+from spatial import SpatialIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = [57, 1000, 10000, 33000, 100000]
+SEED = 0
+
+# A case repeats until it has run this many times or used up the time budget
+REPEATS = 7
+BUDGET_SECONDS = 2.0
+
+NEARBY_QUERIES = 100
+COMPARED_ZIPS = 6
+LABELED = RANKED_METRICS + SCORE_COLUMNS + ['livability_score']
+
+# Slower than the baseline by more than this is flagged by --compare
+REGRESSION = 0.10
+
+
+class Dataset:
+    """One synthetic size, written to disk and scored once, shared by every case."""
+
+    def __init__(self, n_rows, tmp_dir, seed=SEED):
+        self.n_rows = n_rows
+        self.raw = make_dataset(n_rows, seed)
+        self.path = os.path.join(tmp_dir, f'zips_{n_rows}.csv')
+        self.raw.to_csv(self.path, index=False)
+        self.snapshot_dir = os.path.join(tmp_dir, 'snapshots')
+        build_snapshot(self.path, self.snapshot_dir)
+
+        self.df = read_csv(self.path)
+        self.scored = add_label_columns(calculate_scores(self.df, DEFAULT_WEIGHTS), LABELED)
+        self.version = score_version(data_fingerprint(self.df))
+
+        rng = np.random.default_rng(seed)
+        self.query_pos = rng.integers(0, n_rows, NEARBY_QUERIES)
+        self.compared = self.scored.iloc[np.sort(rng.choice(n_rows, min(COMPARED_ZIPS, n_rows),
+                                                            replace=False))]
+
+
+# Each case takes a Dataset and returns the zero-argument call that gets timed
+
+def case_load_csv(data):
+    return lambda: read_csv(data.path)
+
+
+def case_load_snapshot(data):
+    return lambda: load_dataset(data.path, data.snapshot_dir)
+
+
+def case_calculate_scores(data):
+    return lambda: calculate_scores(data.df, DEFAULT_WEIGHTS)
+
+
+def case_rank_percentile(data):
+    return lambda: add_rank_columns(data.scored, LABELED)
+
+
+def case_labels(data):
+    return lambda: add_label_columns(data.scored, LABELED)
+
+
+def case_spatial_index(data):
+    return lambda: SpatialIndex(data.df['latitude'], data.df['longitude'])
+
+
+def case_nearby_search(data):
+    index = SpatialIndex(data.df['latitude'], data.df['longitude'])
+
+    def run():
+        for pos in data.query_pos:
+            index.nearest(pos, 6)
+            index.nearest(pos, 6, radius_miles=10)
+    return run
+
+
+def case_zip_options(data):
+    return lambda: ZipOptions(data.scored, ZipSearchIndex(data.scored))
+
+
+def case_map_build(data):
+    row = data.scored.iloc[0]
+
+    def run():
+        html, map_name = render_base_map(data.scored)
+        return add_selection_overlay(html, map_name, row, 12)
+    return run
+
+
+# Chart cases build uncached, as for a zip or comparison set seen for the first
+# time. st.plotly_chart serializes the figure, so that is part of the cost
+
+def case_radar_chart(data):
+    cache = ArtifactCache([])
+    return lambda: radar_figure(data.scored, data.version, 0, cache=cache).to_json()
+
+
+def case_comparison_charts(data):
+    cache = ArtifactCache([])
+    return lambda: comparison_figure(data.compared, data.version, DEFAULT_WEIGHTS,
+                                     cache=cache).to_json()
+
+
+def case_comparison_table(data):
+    cache = ArtifactCache([])
+    return lambda: comparison_table(data.compared, data.version, DEFAULT_WEIGHTS, cache=cache)
+
+
+def case_rankings_tables(data):
+    # No tiers: every call builds, as on a cache miss
+    cache = ArtifactCache([])
+
+    def run():
+        rank_table(data.scored, data.version, DEFAULT_WEIGHTS, largest=True, cache=cache)
+        rank_table(data.scored, data.version, DEFAULT_WEIGHTS, largest=False, cache=cache)
+    return run
+
+
+def case_leaderboard(data):
+    # Uncached sort order, then the selected zip's page, as on a first visit
+    cache = ArtifactCache([])
+    pos = int(data.query_pos[0])
+
+    def run():
+        order = sort_order(data.scored, data.version, DEFAULT_WEIGHTS, cache=cache)
+        leaderboard_page(data.scored, order, 'livability_score', page_of(order, pos, 25), 25, pos)
+    return run
+
+
+def case_range_filter(data):
+    # Indexes built, as after the first query; a mid-range income, crime and score filter
+    engine = QueryEngine(data.scored)
+    ranges = {col: tuple(np.quantile(data.scored[col], [0.25, 0.75]).tolist())
+              for col in ['median_income', 'crime_rate', 'livability_score']}
+    engine.filter(ranges)
+    return lambda: engine.best(engine.filter(ranges), 100)
+
+
+def case_similar_zips(data):
+    index = SimilarityIndex(data.scored)
+    engine = QueryEngine(data.scored)
+    filtered = engine.filter({'median_income': tuple(
+        np.quantile(data.scored['median_income'], [0.25, 0.75]).tolist())})
+
+    def run():
+        for pos in data.query_pos[:10]:
+            index.similar(pos, 10)
+            index.similar(pos, 10, filtered)
+    return run
+
+
+def export_case(fmt):
+    def case(data):
+        return lambda: export_bytes(data.scored, fmt=fmt)
+    return case
+
+
+CASES = {
+    'load_csv': case_load_csv,
+    'load_snapshot': case_load_snapshot,
+    'calculate_scores': case_calculate_scores,
+    'rank_percentile': case_rank_percentile,
+    'labels': case_labels,
+    'spatial_index': case_spatial_index,
+    'nearby_search': case_nearby_search,
+    'zip_options': case_zip_options,
+    'map_build': case_map_build,
+    'radar_chart': case_radar_chart,
+    'comparison_charts': case_comparison_charts,
+    'comparison_table': case_comparison_table,
+    'rankings_tables': case_rankings_tables,
+    'leaderboard': case_leaderboard,
+    'range_filter': case_range_filter,
+    'similar_zips': case_similar_zips,
+    **{f'export_{fmt}': export_case(fmt) for fmt in EXPORT_FORMATS},
+}
+
+
+def measure(func, repeats=REPEATS, budget=BUDGET_SECONDS):
+    """Per-call seconds: an untimed warm-up, then up to `repeats` runs within the budget."""
+    start = time.perf_counter()
+    func()
+    warmup = time.perf_counter() - start
+    runs = max(1, min(repeats, int(budget / max(warmup, 1e-9))))
+
+    times = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return times
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def environment():
+    return {
+        'commit': git_commit(),
+        'timestamp': time.time(),
+        'machine': f"{platform.node()} {platform.machine()} {os.cpu_count()} cpu",
+        'python': platform.python_version(),
+        'versions': {module.__name__: module.__version__
+                     for module in [np, pd, scipy, plotly, folium]},
+        'seed': SEED,
+    }
+
+
+def run_suite(sizes, cases, repeats=REPEATS, budget=BUDGET_SECONDS):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in sizes:
+            data = Dataset(n_rows, tmp_dir)
+            for name in cases:
+                times = measure(CASES[name](data), repeats, budget)
+                result = {'case': name, 'rows': n_rows, 'repeats': len(times),
+                          'min_ms': min(times) * 1000, 'median_ms': statistics.median(times) * 1000}
+                results.append(result)
+                print(f"{name:<18} {n_rows:>8} {result['min_ms']:>12.2f} "
+                      f"{result['median_ms']:>12.2f} {len(times):>4}", flush=True)
+            del data
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION):
+    """Print min-time ratios against a saved run; returns the regressed (case, rows) pairs."""
+    old = {(r['case'], r['rows']): r for r in baseline['results']}
+    env = baseline.get('environment', {})
+    if env.get('machine') != environment()['machine']:
+        print(f"\nNote: baseline ran on {env.get('machine')!r}; timings may not be comparable")
+
+    print(f"\nvs {env.get('commit')} (min ms)")
+    print(f"{'case':<18} {'rows':>8} {'baseline':>12} {'now':>12} {'ratio':>7}")
+    regressed = []
+    for r in results:
+        before = old.get((r['case'], r['rows']))
+        if before is None:
+            continue
+        ratio = r['min_ms'] / before['min_ms'] if before['min_ms'] else float('inf')
+        flag = '  slower' if ratio > 1 + threshold else '  faster' if ratio < 1 - threshold else ''
+        if ratio > 1 + threshold:
+            regressed.append((r['case'], r['rows']))
+        print(f"{r['case']:<18} {r['rows']:>8} {before['min_ms']:>12.2f} {r['min_ms']:>12.2f} "
+              f"{ratio:>7.2f}{flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--budget', type=float, default=BUDGET_SECONDS,
+                        help="seconds of timed runs per case and size before stopping early")
+    parser.add_argument('--output', help="write the results as JSON here")
+    parser.add_argument('--compare', metavar='BASELINE', help="a JSON file from an earlier --output")
+    args = parser.parse_args(argv)
+
+    # Folium warns about the CartoDB tile key on every map
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    print(f"{'case':<18} {'rows':>8} {'min ms':>12} {'median ms':>12} {'runs':>4}")
+    results = run_suite(args.rows, args.cases, args.repeats, args.budget)
+    report = {'environment': environment(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            regressed = compare(results, json.load(f))
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Per-view rerun benchmark - runs the dashboard headlessly with each tab open
+Only the open tab executes, so a rerun costs the shared header/sidebar plus one view
+instead of the sum of all six
+
+Usage: python -m benchmarks.bench_views [--rows 57 10000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import statistics
+import tempfile
+import time
+import warnings
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import write_dataset
+from datastore import DATA_FILE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'dashboard.py')
+
+VIEWS = ["📊 Detailed Analysis", "🗺️ Map View", "📈 Comparisons", "📉 Rankings",
+         "🔎 Find Zips", "📚 Interpretations"]
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return time.perf_counter() - start
+
+
+def bench_views(repeat):
+    # Caches are process-wide; start every dataset size cold
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    at = AppTest.from_file(SCRIPT, default_timeout=600)
+    cold = timed_run(at)
+
+    timings = {}
+    for view in VIEWS:
+        at.session_state['main_tabs'] = view
+        timed_run(at)  # first open fills that view's caches
+        if view == "📈 Comparisons":
+            at.multiselect[0].select(at.multiselect[0].options[0])
+            timed_run(at)
+        timings[view] = statistics.median(timed_run(at) for _ in range(repeat))
+    return cold, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[57, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.WARNING)
+
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp, working_directory(tmp):
+            write_dataset(os.path.join(tmp, DATA_FILE), n_rows)
+            cold, timings = bench_views(args.repeat)
+
+        print(f"\n{n_rows} rows - cold start {cold * 1000:.0f} ms")
+        print(f"  {'open view':<22} {'rerun ms':>9}")
+        for view, seconds in timings.items():
+            print(f"  {view:<22} {seconds * 1000:>9.1f}")
+        # Upper bound for eager tabs: the shared header/sidebar is counted once per view
+        print(f"  {'sum over views':<22} {sum(timings.values()) * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
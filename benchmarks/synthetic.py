@@ -0,0 +1,55 @@
+"""
+Synthetic zip code datasets with the same schema as middlesex_data_real.csv
+Rows are resampled from the real data with jitter so distributions stay realistic
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from datastore import DATA_FILE
+from interpretation import LABELED_COLUMNS, add_label_columns
+from scoring import DEFAULT_WEIGHTS, calculate_scores
+
+SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), DATA_FILE)
+
+JITTER = {
+    'median_income': 0.15,
+    'pct_bachelors_plus': 0.10,
+    'unemployment_rate': 0.20,
+    'median_home_value': 0.15,
+    'housing_burden': 0.08,
+    'mean_commute_time': 0.10,
+    'crime_rate': 0.25,
+    'population': 0.30,
+}
+
+
+def make_dataset(n_rows, seed=0, source=SOURCE):
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(source, dtype={'zip_code': 'str'})
+    df = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+
+    df['zip_code'] = [f"{i:05d}" for i in range(n_rows)]
+    df['city'] = df['city'] + ' ' + (np.arange(n_rows) // len(base)).astype(str)
+    for col, scale in JITTER.items():
+        df[col] = df[col] * rng.normal(1.0, scale, n_rows).clip(0.5, 1.5)
+    for col in ['median_income', 'median_home_value', 'population']:
+        df[col] = df[col].round().astype(int)
+    df['latitude'] += rng.uniform(-4, 4, n_rows)
+    df['longitude'] += rng.uniform(-20, 10, n_rows)
+    df['education_index'] = df['pct_bachelors_plus']
+    df['transportation_index'] = df['mean_commute_time']
+    return df.round(4)
+
+
+def write_dataset(path, n_rows, seed=0):
+    make_dataset(n_rows, seed).to_csv(path, index=False)
+    return path
+
+
+def make_scored_dataset(n_rows, seed=0, weights=DEFAULT_WEIGHTS):
+    """Synthetic rows run through the same scoring and labeling as the dashboard."""
+    df = calculate_scores(make_dataset(n_rows, seed), weights)
+    return add_label_columns(df, [source for source, _, _ in LABELED_COLUMNS])
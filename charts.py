@@ -0,0 +1,172 @@
+"""
+Plotly figure factory for the score profile and comparison views
+The static parts - layouts, the shared colour scale and the region-average radar
+trace - are built once; per-selection figures (and the comparison table) are
+assembled from them and kept in a process-wide LRU keyed by score version, weights
+and the zips shown. They are shared between sessions and must not be mutated
+(st.plotly_chart and st.dataframe only read them)
+"""
+
+import plotly.colors
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from artifacts import ArtifactCache, MemoryTier, radar_baseline
+
+RADAR_CATEGORIES = {
+    'crime_score': 'Safety',
+    'education_score': 'Education',
+    'jobs_score': 'Jobs',
+    'housing_score': 'Housing',
+    'transportation_score': 'Transportation',
+}
+
+# (column, title, emoji) for each comparison facet, in display order
+COMPARISON_CHARTS = [
+    ('crime_score', 'Safety Score', '🛡️'),
+    ('education_score', 'Education Score', '🎓'),
+    ('jobs_score', 'Jobs Score', '💼'),
+    ('housing_score', 'Housing Score', '🏠'),
+    ('transportation_score', 'Transportation Score', '🚗'),
+    ('livability_score', 'Overall Livability', '⭐'),
+]
+COMPARISON_COLUMNS = 2
+FACET_HEIGHT = 300
+
+# Comparison table column -> header. Values stay numeric; the dashboard formats
+# them through st.column_config, so the browser still sorts them as numbers
+COMPARISON_TABLE_COLUMNS = {
+    'zip_code': 'Zip',
+    'city': 'City',
+    'livability_score': 'Overall',
+    'crime_score': 'Safety',
+    'education_score': 'Education',
+    'jobs_score': 'Jobs',
+    'housing_score': 'Housing',
+    'transportation_score': 'Transport',
+    'median_income': 'Med. Income',
+    'median_home_value': 'Med. Home Value',
+    'population': 'Population',
+}
+
+SCORE_COLORSCALE = plotly.colors.get_colorscale('RdYlGn')
+
+# Assembled figures kept per process, least recently used evicted first
+FIGURE_ENTRIES = 256
+_figures = ArtifactCache([MemoryTier(FIGURE_ENTRIES)])
+
+RADAR_LAYOUT = go.Layout(
+    polar=dict(
+        radialaxis=dict(
+            visible=True,
+            range=[0, 100],
+            tickfont=dict(size=12, color='#1f2937'),
+            gridcolor='rgba(0,0,0,0.1)'
+        ),
+        angularaxis=dict(
+            tickfont=dict(size=14, color='#1e40af')
+        ),
+        bgcolor='rgba(255,255,255,0.9)'
+    ),
+    showlegend=True,
+    legend=dict(
+        x=0.5,
+        y=-0.1,
+        xanchor='center',
+        orientation='h',
+        font=dict(size=12, color='#1f2937')
+    ),
+    height=500,
+    paper_bgcolor='#ffffff',
+    plot_bgcolor='#ffffff'
+)
+
+
+def _comparison_layout():
+    rows = -(-len(COMPARISON_CHARTS) // COMPARISON_COLUMNS)
+    fig = make_subplots(rows=rows, cols=COMPARISON_COLUMNS, vertical_spacing=0.12,
+                        subplot_titles=[f"{emoji} {title}" for _, title, emoji in COMPARISON_CHARTS])
+    fig.update_layout(
+        height=FACET_HEIGHT * rows,
+        showlegend=False,
+        paper_bgcolor='#ffffff',
+        plot_bgcolor='#ffffff',
+        font=dict(color='#1f2937'),
+        coloraxis=dict(colorscale=SCORE_COLORSCALE, cmin=0, cmax=100,
+                       colorbar=dict(title='Score')),
+        margin=dict(t=60)
+    )
+    # Zip codes are labels, not numbers
+    fig.update_xaxes(type='category', title_text='Zip Code')
+    fig.update_yaxes(range=[0, 100], title_text='Score')
+    return fig.layout
+
+
+def baseline_trace(scored, version, cache=None):
+    """Region-average radar trace, built once per score version."""
+    def build():
+        baseline = radar_baseline(scored, version, cache)
+        return go.Scatterpolar(
+            r=[baseline[col] for col in RADAR_CATEGORIES],
+            theta=list(RADAR_CATEGORIES.values()),
+            fill='toself',
+            name='Region Average',
+            line=dict(color='rgb(156, 163, 175)', width=2, dash='dash'),
+            fillcolor='rgba(156, 163, 175, 0.1)'
+        )
+    return (cache or _figures).get_or_build('radar_baseline_trace', [version], build)
+
+
+def radar_figure(scored, version, pos, cache=None):
+    """Score profile of the zip at row pos over the region average.
+
+    Sub-scores do not depend on the weights, so neither does the key.
+    """
+    figures = cache or _figures
+    row = scored.iloc[pos]
+
+    def build():
+        selected = go.Scatterpolar(
+            r=[float(row[col]) for col in RADAR_CATEGORIES],
+            theta=list(RADAR_CATEGORIES.values()),
+            fill='toself',
+            name=f"{row['zip_code']} - {row['city']}",
+            line=dict(color='rgb(99, 102, 241)', width=3),
+            fillcolor='rgba(99, 102, 241, 0.3)'
+        )
+        return go.Figure(data=[selected, baseline_trace(scored, version, cache)], layout=RADAR_LAYOUT)
+    return figures.get_or_build('radar_figure', [version, row['zip_code']], build)
+
+
+def comparison_figure(compared, version, weights, cache=None):
+    """Every score across the compared zips as one faceted bar chart on a shared 0-100 scale."""
+    cache = cache or _figures
+    zips = compared['zip_code'].astype(str).tolist()
+
+    def build():
+        layout = cache.get_or_build('comparison_layout', [], _comparison_layout)
+        traces = []
+        for i, (col_name, title, _) in enumerate(COMPARISON_CHARTS):
+            values = compared[col_name].to_numpy(dtype=float).round(1)
+            axis = '' if i == 0 else str(i + 1)
+            traces.append(go.Bar(
+                x=zips,
+                y=values,
+                name=title,
+                xaxis=f'x{axis}',
+                yaxis=f'y{axis}',
+                marker=dict(color=values, coloraxis='coloraxis',
+                            line=dict(color='rgb(8,48,107)', width=1.5)),
+                hovertemplate='Zip Code %{x}<br>Score %{y:.1f}<extra></extra>'
+            ))
+        return go.Figure(data=traces, layout=layout)
+    return cache.get_or_build('comparison_figure', [version, weights, zips], build)
+
+
+def comparison_table(compared, version, weights, cache=None):
+    """The compared zips' scores and key metrics under display headers, unformatted."""
+    zips = compared['zip_code'].astype(str).tolist()
+
+    def build():
+        return compared[list(COMPARISON_TABLE_COLUMNS)].rename(columns=COMPARISON_TABLE_COLUMNS)
+    return (cache or _figures).get_or_build('comparison_table', [version, weights, zips], build)
@@ -1,26 +1,84 @@
 """
-Middlesex County Livability Dashboard - Interactive Zip Code Analysis
+Zip Code Livability Dashboard - Interactive Analysis by County or State
 Professional design with interpretations and insights
 """
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import folium
-from streamlit_folium import st_folium
 import numpy as np
+import os
+from functools import partial, wraps
+from artifacts import (base_map, rank_table, score_version as get_score_version, scored_frame,
+                       sort_order, sub_scores)
+from charts import comparison_figure, comparison_table, radar_figure
+from datastore import build_zip_index, load_dataset
+from export import EXPORT_FORMATS, export_bytes
+from interpretation import (interpret_commute, interpret_crime,
+                            interpret_education, interpret_housing, interpret_income,
+                            interpret_score, interpret_unemployment)
+from leaderboard import PAGE_SIZES, SORT_COLUMNS, leaderboard_page, page_count, page_of
+from mapping import add_selection_overlay
+from profiling import PROFILE_LOG_ENV, Profiler, append_jsonl, profile_mode
+from query import FILTER_COLUMNS, QueryEngine, SimilarityIndex, result_table
+from regions import NORMALIZATION_MODES, discover_regions, global_bounds, regions_version
+from selection import MAX_OPTIONS, ZipOptions, ZipSearchIndex, label_zip
+from spatial import SpatialIndex
+from scoring import DEFAULT_WEIGHTS, data_fingerprint, top_k
 
 # Page configuration
 st.set_page_config(
-    page_title="Middlesex County Livability Dashboard",
+    page_title="Zip Code Livability Dashboard",
     layout="wide",
     initial_sidebar_state="expanded",
     page_icon="🏘️"
 )
 
+# Rerun profiling - ?profile=1 (or ?profile=memory) adds a timing panel to the sidebar
+profiler = Profiler(profile_mode(st.query_params.get('profile')))
+PROFILE_HISTORY = 30
+
+
+def record_profile(profile):
+    # Every profiled run, full or fragment, joins the panel's history and the log
+    history = st.session_state.setdefault('profile_history', [])
+    history.append(round(profile['total_ms'], 1))
+    del history[:-PROFILE_HISTORY]
+
+    log_path = os.environ.get(PROFILE_LOG_ENV)
+    if log_path:
+        append_jsonl(log_path, profile)
+    return history
+
+
+def profiled_fragment(func):
+    """st.fragment whose own reruns are profiled, logged and timed in place.
+
+    Within a full run the fragment is one section of that run's profile. A fragment
+    rerun restarts the finished profiler of the last full run for itself, so the
+    sections inside the fragment land in it; the sidebar panel is outside the
+    fragment and cannot be redrawn, so the total is shown under the fragment.
+    """
+    @st.fragment
+    @wraps(func)
+    def run():
+        if not profiler.enabled or not profiler.finished:
+            with profiler.section(f'fragment {func.__name__}'):
+                return func()
+        profiler.restart()
+        try:
+            with profiler.section(f'fragment {func.__name__}'):
+                func()
+            profile = profiler.report(region=region['id'], tab=st.session_state.get('main_tabs'),
+                                      selected_zip=selected_zip, fragment=func.__name__)
+        finally:
+            profiler.stop()
+        record_profile(profile)
+        st.caption(f"⏱️ {profile['total_ms']:.0f} ms this fragment rerun")
+    return run
+
 # Custom CSS for beautiful design - DARK MODE COMPATIBLE
-st.markdown("""
+with profiler.section('css'):
+    st.markdown("""
 <style>
     /* Force light background for entire app */
     [data-testid="stAppViewContainer"] {
@@ -357,241 +415,282 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data
+# Load data - each region's file is read the first time the region is selected.
+# Every per-region cache below keeps at most REGION_CACHE_SIZE entries and evicts
+# the least recently used, so a deployment with hundreds of regions stays bounded
+REGION_CACHE_SIZE = 8
 
 
-@st.cache_data
-def load_data():
+# A resource, not data: st.cache_data would hand every rerun of every session
+# its own unpickled copy of the frame. It is shared read-only instead
+@st.cache_resource(max_entries=REGION_CACHE_SIZE)
+def load_data(path):
     try:
-        df = pd.read_csv('middlesex_data_real.csv')
-        df['zip_code'] = df['zip_code'].astype(str)
-        return df
+        df = load_dataset(path)
+        return df, data_fingerprint(df)
     except FileNotFoundError:
         st.error("⚠️ Data file not found! Please run 'create_real_data.py' first.")
         st.stop()
+    except ValueError as e:
+        # Malformed CSV rows, or values that do not fit a column's type
+        st.error(f"⚠️ Could not read {path}: {e}")
+        st.stop()
+
+
+@st.cache_data
+def get_global_bounds(version, _regions):
+    return global_bounds(_regions)
 
-# Calculate scores
 
+def get_region(regions):
+    # Read the region picker ahead of the widget, which renders later in the sidebar
+    if not regions:
+        st.error("⚠️ Data file not found! Please run 'create_real_data.py' first.")
+        st.stop()
+    if st.session_state.get('region') not in regions:
+        st.session_state['region'] = next(iter(regions))
+    return regions[st.session_state['region']]
 
-def calculate_scores(df):
-    df = df.copy()
 
-    df['crime_score'] = 100 - ((df['crime_rate'] - df['crime_rate'].min()) /
-                               (df['crime_rate'].max() - df['crime_rate'].min()) * 100)
-    df['education_score'] = ((df['education_index'] - df['education_index'].min()) /
-                             (df['education_index'].max() - df['education_index'].min()) * 100)
-    df['jobs_score'] = 100 - ((df['unemployment_rate'] - df['unemployment_rate'].min()) /
-                              (df['unemployment_rate'].max() - df['unemployment_rate'].min()) * 100)
-    df['housing_score'] = 100 - ((df['housing_burden'] - df['housing_burden'].min()) /
-                                 (df['housing_burden'].max() - df['housing_burden'].min()) * 100)
-    df['transportation_score'] = 100 - ((df['transportation_index'] - df['transportation_index'].min()) /
-                                        (df['transportation_index'].max() - df['transportation_index'].min()) * 100)
+def reset_region_widgets():
+    # City names and searches from the previous region would not match the new one
+    for key in ['city_selector', 'zip_search', 'zip_selector', 'compare_search', 'compare_zips']:
+        st.session_state.pop(key, None)
+    # Range filters are bounded by the region's values
+    for key in [key for key in st.session_state if str(key).startswith('filter_')]:
+        st.session_state.pop(key, None)
 
-    weights = {'crime_score': 0.25, 'education_score': 0.25, 'jobs_score': 0.20,
-               'housing_score': 0.20, 'transportation_score': 0.10}
+# Score the dataset - the normalized sub-scores are cached per data fingerprint
+# and normalization, the weighted composite per score version and weight set, so
+# reruns that only change the selection never rescore and weight changes only
+# redo the dot product. Scored frames, rank tables, radar baselines and map HTML
+# come from the artifact cache: an LRU shared by every session in this process,
+# backed by the local disk shared by every replica and filled by precompute.py
 
-    df['livability_score'] = (
-        df['crime_score'] * weights['crime_score'] +
-        df['education_score'] * weights['education_score'] +
-        df['jobs_score'] * weights['jobs_score'] +
-        df['housing_score'] * weights['housing_score'] +
-        df['transportation_score'] * weights['transportation_score']
-    )
+WEIGHT_SLIDERS = [
+    ('crime_score', '🛡️ Safety'),
+    ('education_score', '🎓 Education'),
+    ('jobs_score', '💼 Jobs'),
+    ('housing_score', '🏠 Housing'),
+    ('transportation_score', '🚗 Transport'),
+]
 
-    return df
 
-# Interpretation functions
+@st.cache_resource(max_entries=REGION_CACHE_SIZE)
+def get_zip_index(fingerprint, _df):
+    return build_zip_index(_df)
 
 
-def interpret_score(score):
-    if score >= 80:
-        return "Excellent", "#10b981", "🌟"
-    elif score >= 65:
-        return "Good", "#3b82f6", "✅"
-    elif score >= 50:
-        return "Average", "#f59e0b", "⚠️"
-    else:
-        return "Needs Improvement", "#ef4444", "❌"
+@st.cache_resource(max_entries=REGION_CACHE_SIZE)
+def get_spatial_index(fingerprint, _df):
+    return SpatialIndex(_df['latitude'], _df['longitude'])
 
 
-def get_percentile(value, series):
-    return int((series < value).sum() / len(series) * 100)
+@st.cache_resource(max_entries=REGION_CACHE_SIZE)
+def get_search_index(fingerprint, _df):
+    return ZipSearchIndex(_df)
 
 
-def interpret_income(income):
-    if income >= 150000:
-        return "Very High Income - Top tier economic status"
-    elif income >= 100000:
-        return "High Income - Above average prosperity"
-    elif income >= 75000:
-        return "Upper Middle Income - Comfortable living"
-    elif income >= 50000:
-        return "Middle Income - Moderate economic status"
-    else:
-        return "Lower Income - Economic challenges present"
-
-
-def interpret_education(pct):
-    if pct >= 75:
-        return "Highly Educated - Strong intellectual capital"
-    elif pct >= 60:
-        return "Well Educated - Above average educational attainment"
-    elif pct >= 45:
-        return "Moderately Educated - Average education levels"
-    elif pct >= 30:
-        return "Lower Education - Below average attainment"
-    else:
-        return "Low Education - Significant educational gaps"
+@st.cache_resource(max_entries=REGION_CACHE_SIZE)
+def get_zip_options(fingerprint, score_version, weights, _df):
+    return ZipOptions(_df, get_search_index(fingerprint, _df))
 
 
-def interpret_unemployment(rate):
-    if rate <= 2.5:
-        return "Excellent Job Market - Very low unemployment"
-    elif rate <= 4.0:
-        return "Strong Job Market - Healthy employment"
-    elif rate <= 6.0:
-        return "Moderate Job Market - Average unemployment"
-    else:
-        return "Weak Job Market - High unemployment challenges"
+@st.cache_resource(max_entries=REGION_CACHE_SIZE)
+def get_query_engine(score_version, weights, _df):
+    return QueryEngine(_df)
 
 
-def interpret_housing(burden):
-    if burden <= 28:
-        return "Very Affordable - Low housing cost burden"
-    elif burden <= 32:
-        return "Affordable - Manageable housing costs"
-    elif burden <= 38:
-        return "Moderately Expensive - Above average costs"
-    else:
-        return "Expensive - High housing cost burden"
+@st.cache_resource(max_entries=REGION_CACHE_SIZE)
+def get_similarity_index(score_version, _df):
+    # Sub-scores only, so one index serves every weight set
+    return SimilarityIndex(_df)
 
 
-def interpret_commute(time):
-    if time <= 23:
-        return "Excellent - Very short commute"
-    elif time <= 27:
-        return "Good - Reasonable commute time"
-    elif time <= 32:
-        return "Average - Typical commute duration"
-    else:
-        return "Long - Extended commute time"
+def format_count(value, prefix=''):
+    # Census files suppress counts and dollar amounts for small areas
+    return f"{prefix}{int(value):,}" if pd.notna(value) else "N/A"
 
 
-def interpret_crime(rate):
-    if rate <= 7:
-        return "Very Safe - Low crime area"
-    elif rate <= 12:
-        return "Safe - Below average crime"
-    elif rate <= 18:
-        return "Moderately Safe - Average crime levels"
-    else:
-        return "Higher Crime - Above average crime rates"
+def get_weights():
+    # Read the slider values ahead of the widgets, which render later in the sidebar
+    pcts = {col: st.session_state.get(f'weight_{col}', round(DEFAULT_WEIGHTS[col] * 100))
+            for col, _ in WEIGHT_SLIDERS}
+    total = sum(pcts.values())
+    if total == 0:
+        return DEFAULT_WEIGHTS
+    return {col: pct / total for col, pct in pcts.items()}
 
 
 # Load data
-df = load_data()
-df = calculate_scores(df)
+with profiler.section('load_data'):
+    regions = discover_regions()
+    region = get_region(regions)
+    region_name = region['label']
+    df, data_version = load_data(region['path'])
+    zip_index = get_zip_index(data_version, df)
+    weights = get_weights()
+
+# Global normalization scales every region against the bounds of all of them
+with profiler.section('calculate_scores'):
+    bounds = None
+    if len(regions) > 1 and st.session_state.get('normalization') == 'global':
+        bounds = get_global_bounds(regions_version(regions), regions)
+    score_version = get_score_version(data_version, bounds)
+
+    df = scored_frame(sub_scores(df, score_version, bounds), score_version, weights)
+
+with profiler.section('zip_options'):
+    zip_options = get_zip_options(data_version, score_version, weights, df)
 
 # Title
-st.markdown("<h1>🏘️ Middlesex County, MA - Livability Dashboard</h1>",
+st.markdown(f"<h1>🏘️ {region_name} - Livability Dashboard</h1>",
             unsafe_allow_html=True)
-st.markdown("<p style='text-align: center; font-size: 18px; color: #1e40af;'><i>Comprehensive Analysis of Quality of Life Across 57 Zip Codes</i></p>", unsafe_allow_html=True)
-
-# Sidebar - Zip Code Selector
-with st.sidebar:
-    st.markdown("## 🔍 Zip Code Selector")
-
-    # County info box
-    st.markdown(f"""
-    <div class='county-box'>
-        📍 Middlesex County, MA<br>
-        <span style='font-size: 14px;'>{len(df)} zip codes available</span>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("---")
+st.markdown(f"<p style='text-align: center; font-size: 18px; color: #1e40af;'><i>Comprehensive Analysis of Quality of Life Across {len(df)} Zip Codes</i></p>", unsafe_allow_html=True)
+
+# The selected zip lives in session state so the city/zip pickers can rerun as a
+# fragment; the rest of the page only reruns when the selection actually changes
+if st.session_state.get('selected_zip') not in zip_index:
+    st.session_state['selected_zip'] = df['zip_code'].iloc[top_k(
+        df['livability_score'], 1)[0]]
+selected_zip = st.session_state['selected_zip']
+selected_pos = zip_index[selected_zip]
+
+
+@profiled_fragment
+def render_zip_selector():
+    # Search narrows both lists server-side, so only the best matches reach the browser
+    query = st.text_input(
+        "Search by zip code or city:",
+        placeholder="e.g. 0185 or Lowell",
+        key='zip_search'
+    )
+    matches = zip_options.search(query)
 
     # STEP 1: Select City (optional filter)
     st.markdown("**Filter by City (Optional):**")
-    available_cities = ['All Cities'] + sorted(df['city'].unique().tolist())
+    city_choices, n_cities = zip_options.city_options(matches, st.session_state.get('city_selector'))
     selected_city = st.selectbox(
-        "Choose a city within Middlesex County:",
-        available_cities,
+        f"Choose a city within {region_name}:",
+        city_choices,
         index=0,
         key='city_selector'
     )
-
-    # Filter by city if selected
-    if selected_city != 'All Cities':
-        display_df = df[df['city'] == selected_city].copy()
+    if n_cities > MAX_OPTIONS:
+        st.caption(f"Listing the first {MAX_OPTIONS} of {n_cities:,} cities alphabetically - "
+                   f"search to narrow down")
+
+    # Filter by city if selected - a precomputed slice or mask, already sorted by score
+    city_options, n_matches = zip_options.zip_options(matches, selected_city)
+    if matches is not None:
+        st.markdown(f"*{n_matches} zip codes match \"{query.strip()}\"*")
+    elif selected_city != 'All Cities':
         st.markdown(
-            f"*Showing {len(display_df)} zip codes in {selected_city}*")
+            f"*Showing {n_matches} zip codes in {selected_city}*")
     else:
-        display_df = df.copy()
         st.markdown(
-            f"*Showing all {len(display_df)} zip codes in Middlesex County*")
+            f"*Showing all {n_matches} zip codes in {region_name}*")
+    if len(city_options) < n_matches:
+        st.caption(f"Listing the top {len(city_options)} by livability - search to narrow down")
 
     st.markdown("---")
 
     # STEP 2: Select Zip Code (WITHOUT SCORES)
     st.markdown("**Select Zip Code:**")
 
-    # Sort by livability score for better UX
-    display_df_sorted = display_df.sort_values(
-        'livability_score', ascending=False)
-
-    # Create zip options WITHOUT scores shown
-    zip_options = [f"{row['zip_code']} - {row['city']}"
-                   for _, row in display_df_sorted.iterrows()]
+    # Keep the current zip selected if it is still listed, otherwise wait for
+    # a pick instead of jumping the whole page to another zip
+    city_options = city_options.tolist()
+    if st.session_state.get('zip_selector') not in city_options:
+        current_option = zip_options.labels[selected_pos]
+        st.session_state['zip_selector'] = (
+            current_option if current_option in city_options else None)
 
     selected_option = st.selectbox(
         "Choose a zip code to analyze:",
-        zip_options,
-        index=0,
+        city_options,
+        placeholder="Choose a zip code from the list",
         key='zip_selector'
     )
 
-    # Extract zip code
-    selected_zip = str(selected_option.split(" - ")[0])
+    # Extract zip code - a new selection reruns the whole app
+    if selected_option is not None:
+        picked_zip = label_zip(selected_option)
+        if picked_zip != st.session_state['selected_zip']:
+            st.session_state['selected_zip'] = picked_zip
+            st.rerun()
+
+
+# Sidebar - Zip Code Selector
+with st.sidebar, profiler.section('sidebar'):
+    st.markdown("## 🔍 Zip Code Selector")
+
+    if len(regions) > 1:
+        st.selectbox(
+            "Choose a region:",
+            list(regions),
+            format_func=lambda region_id: regions[region_id]['label'],
+            key='region',
+            on_change=reset_region_widgets
+        )
+
+    # County info box
+    st.markdown(f"""
+    <div class='county-box'>
+        📍 {region_name}<br>
+        <span style='font-size: 14px;'>{len(df)} zip codes available</span>
+    </div>
+    """, unsafe_allow_html=True)
 
     st.markdown("---")
 
-    # Safety check
-    if df[df['zip_code'] == selected_zip].empty:
-        st.error(f"⚠️ Zip code {selected_zip} not found in data!")
-        st.stop()
+    render_zip_selector()
+
+    st.markdown("---")
 
     # Show quick stats for selected zip
-    selected_data = df[df['zip_code'] == selected_zip].iloc[0]
+    selected_data = df.iloc[selected_pos]
 
     st.markdown("### 📊 Quick Overview")
     st.metric("Livability Score",
               f"{selected_data['livability_score']:.1f}/100")
     st.metric("City", selected_data['city'])
-    st.metric("Population", f"{int(selected_data['population']):,}")
+    st.metric("Population", format_count(selected_data['population']))
 
     st.markdown("---")
     st.markdown("### 🎯 Methodology")
-    st.markdown("""
-    **Composite Score Weights:**
-    - 🛡️ Safety: 25%
-    - 🎓 Education: 25%
-    - 💼 Jobs: 20%
-    - 🏠 Housing: 20%
-    - 🚗 Transport: 10%
-    """)
+    st.markdown("**Composite Score Weights:**")
+    for col, label in WEIGHT_SLIDERS:
+        st.slider(label, 0, 100, round(DEFAULT_WEIGHTS[col] * 100), step=5,
+                  format="%d%%", key=f'weight_{col}')
+
+    if all(st.session_state[f'weight_{col}'] == 0 for col, _ in WEIGHT_SLIDERS):
+        st.warning("⚠️ All weights are zero - using the default weights.")
+    else:
+        st.caption(" | ".join(f"{label}: {weights[col] * 100:.0f}%"
+                              for col, label in WEIGHT_SLIDERS))
+
+    if len(regions) > 1:
+        st.radio(
+            "Normalize metrics across:",
+            list(NORMALIZATION_MODES),
+            format_func=NORMALIZATION_MODES.get,
+            horizontal=True,
+            key='normalization',
+            help="\"This region\" scores each zip against its own region; \"All regions\" "
+                 "makes scores comparable between regions. Ranks stay within the region."
+        )
 
     st.markdown("---")
 
     # Show county statistics
-    st.markdown("### 📈 County Statistics")
+    st.markdown("### 📈 Region Statistics")
     st.metric("Avg Livability", f"{df['livability_score'].mean():.1f}")
-    best_zip = df.loc[df['livability_score'].idxmax()]
+    best_zip = df.iloc[top_k(df['livability_score'], 1)[0]]
     st.metric("Best Zip Code", f"{best_zip['zip_code']} ({best_zip['city']})")
     st.metric("Total Population", f"{int(df['population'].sum()):,}")
 
-# Get selected zip code data
-selected_data = df[df['zip_code'] == selected_zip].iloc[0]
+# Overall rating for the selected zip code
 overall_rating, overall_color, overall_emoji = interpret_score(
     selected_data['livability_score'])
 
@@ -603,17 +702,16 @@ st.markdown(f"""
     <h1 style='color: white !important; margin: 0; font-size: 48px;'>{overall_emoji} {selected_zip} - {selected_data['city']}</h1>
     <h2 style='color: white !important; margin: 10px 0; font-size: 64px; font-weight: 700;'>{selected_data['livability_score']:.1f}/100</h2>
     <p style='font-size: 28px; margin: 0; color: white !important;'>{overall_rating} Livability Score</p>
-    <p style='font-size: 18px; margin-top: 10px; opacity: 0.9; color: white !important;'>Ranked #{(df['livability_score'] > selected_data['livability_score']).sum() + 1} out of {len(df)} zip codes in Middlesex County</p>
+    <p style='font-size: 18px; margin-top: 10px; opacity: 0.9; color: white !important;'>Ranked #{selected_data['livability_score_rank']} out of {len(df)} zip codes in {region_name}</p>
 </div>
 """, unsafe_allow_html=True)
 
 # Show county context
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.metric("County Average", f"{df['livability_score'].mean():.1f}")
+    st.metric("Region Average", f"{df['livability_score'].mean():.1f}")
 with col2:
-    rank = (df['livability_score'] >
-            selected_data['livability_score']).sum() + 1
+    rank = selected_data['livability_score_rank']
     st.metric("Your Rank", f"#{rank} of {len(df)}")
 with col3:
     better_than_pct = ((len(df) - rank) / len(df) * 100)
@@ -621,17 +719,11 @@ with col3:
 with col4:
     st.metric("City", selected_data['city'])
 
-# Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Detailed Analysis",
-    "🗺️ Map View",
-    "📈 Comparisons",
-    "📉 Rankings",
-    "📚 Interpretations"
-])
+# Tabs - each tab's content lives in a render function so only the open tab runs
+
 
 # TAB 1: Detailed Analysis
-with tab1:
+def render_detailed_analysis():
     st.markdown("## 🔍 Comprehensive Score Breakdown")
 
     # Five variable cards in a row
@@ -680,15 +772,14 @@ with tab1:
         crime_rating, crime_color, crime_emoji = interpret_score(
             selected_data['crime_score'])
         crime_interp = interpret_crime(selected_data['crime_rate'])
-        percentile = get_percentile(
-            selected_data['crime_rate'], df['crime_rate'])
+        percentile = selected_data['crime_rate_pctile']
 
         st.markdown(f"""
         <div class='{"success-box" if selected_data["crime_score"] >= 65 else "warning-box"}'>
             <h4>{crime_emoji} Score: {selected_data['crime_score']:.1f}/100 - {crime_rating}</h4>
             <p><strong>Crime Rate:</strong> {selected_data['crime_rate']:.1f} crimes per 1,000 residents</p>
             <p><strong>Interpretation:</strong> {crime_interp}</p>
-            <p><strong>County Ranking:</strong> Safer than {100-percentile}% of Middlesex County zip codes</p>
+            <p><strong>Region Ranking:</strong> Safer than {100-percentile}% of {region_name} zip codes</p>
             <p><strong>What this means:</strong> {"This is a very safe area with low crime rates. Residents can feel secure in their daily activities." if selected_data['crime_score'] >= 70 else "Crime rates are moderate to high. Extra precautions may be advisable." if selected_data['crime_score'] >= 50 else "Higher crime rates present. Consider safety measures and community involvement."}</p>
         </div>
         """, unsafe_allow_html=True)
@@ -698,15 +789,14 @@ with tab1:
         edu_rating, edu_color, edu_emoji = interpret_score(
             selected_data['education_score'])
         edu_interp = interpret_education(selected_data['pct_bachelors_plus'])
-        percentile = get_percentile(
-            selected_data['pct_bachelors_plus'], df['pct_bachelors_plus'])
+        percentile = selected_data['pct_bachelors_plus_pctile']
 
         st.markdown(f"""
         <div class='{"success-box" if selected_data["education_score"] >= 65 else "neutral-box"}'>
             <h4>{edu_emoji} Score: {selected_data['education_score']:.1f}/100 - {edu_rating}</h4>
             <p><strong>Educational Attainment:</strong> {selected_data['pct_bachelors_plus']:.1f}% have Bachelor's degree or higher</p>
             <p><strong>Interpretation:</strong> {edu_interp}</p>
-            <p><strong>County Ranking:</strong> Better educated than {percentile}% of zip codes</p>
+            <p><strong>Region Ranking:</strong> Better educated than {percentile}% of zip codes</p>
             <p><strong>What this means:</strong> {"This area has exceptional educational attainment, indicating strong schools, intellectual capital, and higher earning potential." if selected_data['education_score'] >= 70 else "Education levels are moderate. Good schools exist but educational attainment varies." if selected_data['education_score'] >= 50 else "Educational attainment is below average. Focus on educational improvement may be needed."}</p>
         </div>
         """, unsafe_allow_html=True)
@@ -716,17 +806,15 @@ with tab1:
         housing_rating, housing_color, housing_emoji = interpret_score(
             selected_data['housing_score'])
         housing_interp = interpret_housing(selected_data['housing_burden'])
-        percentile = 100 - \
-            get_percentile(
-                selected_data['housing_burden'], df['housing_burden'])
+        percentile = 100 - selected_data['housing_burden_pctile']
 
         st.markdown(f"""
         <div class='{"success-box" if selected_data["housing_score"] >= 65 else "warning-box"}'>
             <h4>{housing_emoji} Score: {selected_data['housing_score']:.1f}/100 - {housing_rating}</h4>
             <p><strong>Housing Cost Burden:</strong> {selected_data['housing_burden']:.1f}% of income spent on housing</p>
-            <p><strong>Median Home Value:</strong> ${int(selected_data['median_home_value']):,}</p>
+            <p><strong>Median Home Value:</strong> {format_count(selected_data['median_home_value'], '$')}</p>
             <p><strong>Interpretation:</strong> {housing_interp}</p>
-            <p><strong>County Ranking:</strong> More affordable than {percentile}% of zip codes</p>
+            <p><strong>Region Ranking:</strong> More affordable than {percentile}% of zip codes</p>
             <p><strong>What this means:</strong> {"Housing is affordable relative to incomes. Residents have financial flexibility after housing costs." if selected_data['housing_score'] >= 65 else "Housing costs are moderate. Careful budgeting required." if selected_data['housing_score'] >= 50 else "Housing is expensive relative to incomes. Cost burden may limit other spending."}</p>
         </div>
         """, unsafe_allow_html=True)
@@ -738,17 +826,15 @@ with tab1:
             selected_data['jobs_score'])
         jobs_interp = interpret_unemployment(
             selected_data['unemployment_rate'])
-        percentile = 100 - \
-            get_percentile(
-                selected_data['unemployment_rate'], df['unemployment_rate'])
+        percentile = 100 - selected_data['unemployment_rate_pctile']
 
         st.markdown(f"""
         <div class='{"success-box" if selected_data["jobs_score"] >= 65 else "warning-box"}'>
             <h4>{jobs_emoji} Score: {selected_data['jobs_score']:.1f}/100 - {jobs_rating}</h4>
             <p><strong>Unemployment Rate:</strong> {selected_data['unemployment_rate']:.1f}%</p>
-            <p><strong>Median Income:</strong> ${int(selected_data['median_income']):,}</p>
+            <p><strong>Median Income:</strong> {format_count(selected_data['median_income'], '$')}</p>
             <p><strong>Interpretation:</strong> {jobs_interp}</p>
-            <p><strong>County Ranking:</strong> Better job market than {percentile}% of zip codes</p>
+            <p><strong>Region Ranking:</strong> Better job market than {percentile}% of zip codes</p>
             <p><strong>What this means:</strong> {"Excellent job market with abundant opportunities. Very low unemployment indicates strong economic health." if selected_data['jobs_score'] >= 70 else "Job market is stable with moderate opportunities available." if selected_data['jobs_score'] >= 50 else "Job market challenges exist. Higher unemployment may indicate economic stress."}</p>
         </div>
         """, unsafe_allow_html=True)
@@ -758,32 +844,31 @@ with tab1:
         trans_rating, trans_color, trans_emoji = interpret_score(
             selected_data['transportation_score'])
         trans_interp = interpret_commute(selected_data['mean_commute_time'])
-        percentile = 100 - \
-            get_percentile(
-                selected_data['mean_commute_time'], df['mean_commute_time'])
+        percentile = 100 - selected_data['mean_commute_time_pctile']
 
         st.markdown(f"""
         <div class='{"success-box" if selected_data["transportation_score"] >= 65 else "neutral-box"}'>
             <h4>{trans_emoji} Score: {selected_data['transportation_score']:.1f}/100 - {trans_rating}</h4>
             <p><strong>Mean Commute Time:</strong> {selected_data['mean_commute_time']:.1f} minutes</p>
             <p><strong>Interpretation:</strong> {trans_interp}</p>
-            <p><strong>County Ranking:</strong> Shorter commute than {percentile}% of zip codes</p>
+            <p><strong>Region Ranking:</strong> Shorter commute than {percentile}% of zip codes</p>
             <p><strong>What this means:</strong> {"Excellent location with short commutes. Saves time and reduces stress for daily travel." if selected_data['transportation_score'] >= 65 else "Commute times are average. Plan for typical travel durations." if selected_data['transportation_score'] >= 50 else "Longer commute times. Consider transit options or flexible work arrangements."}</p>
         </div>
         """, unsafe_allow_html=True)
 
         # Income Analysis
         st.markdown("### 💰 Economic Prosperity")
-        income_interp = interpret_income(selected_data['median_income'])
-        percentile = get_percentile(
-            selected_data['median_income'], df['median_income'])
+        income = selected_data['median_income']
+        income_interp = interpret_income(income) if pd.notna(income) else "No income data"
+        percentile = selected_data['median_income_pctile']
+        income = income if pd.notna(income) else 0
 
         st.markdown(f"""
-        <div class='{"success-box" if selected_data["median_income"] >= 100000 else "neutral-box"}'>
-            <h4>💰 Median Household Income: ${int(selected_data['median_income']):,}</h4>
+        <div class='{"success-box" if income >= 100000 else "neutral-box"}'>
+            <h4>💰 Median Household Income: {format_count(selected_data['median_income'], '$')}</h4>
             <p><strong>Interpretation:</strong> {income_interp}</p>
-            <p><strong>County Ranking:</strong> Higher income than {percentile}% of zip codes</p>
-            <p><strong>What this means:</strong> {"This is a highly prosperous area with strong earning power and economic opportunities." if selected_data['median_income'] >= 120000 else "Income levels support a comfortable middle-class lifestyle." if selected_data['median_income'] >= 70000 else "Incomes are below county average. Economic challenges may be present."}</p>
+            <p><strong>Region Ranking:</strong> Higher income than {percentile}% of zip codes</p>
+            <p><strong>What this means:</strong> {"This is a highly prosperous area with strong earning power and economic opportunities." if income >= 120000 else "Income levels support a comfortable middle-class lifestyle." if income >= 70000 else "Incomes are below county average. Economic challenges may be present."}</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -791,160 +876,55 @@ with tab1:
     st.markdown("---")
     st.markdown("## 📊 Visual Score Profile")
 
-    categories = ['Safety', 'Education', 'Jobs', 'Housing', 'Transportation']
-    values = [
-        selected_data['crime_score'],
-        selected_data['education_score'],
-        selected_data['jobs_score'],
-        selected_data['housing_score'],
-        selected_data['transportation_score']
-    ]
+    with profiler.section('chart radar'):
+        fig_radar = radar_figure(df, score_version, selected_pos)
+        st.plotly_chart(fig_radar, width='stretch')
 
-    fig_radar = go.Figure()
-
-    # Add selected zip
-    fig_radar.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        name=f'{selected_zip} - {selected_data["city"]}',
-        line=dict(color='rgb(99, 102, 241)', width=3),
-        fillcolor='rgba(99, 102, 241, 0.3)'
-    ))
-
-    # Add county average
-    avg_values = [
-        df['crime_score'].mean(),
-        df['education_score'].mean(),
-        df['jobs_score'].mean(),
-        df['housing_score'].mean(),
-        df['transportation_score'].mean()
-    ]
 
-    fig_radar.add_trace(go.Scatterpolar(
-        r=avg_values,
-        theta=categories,
-        fill='toself',
-        name='County Average',
-        line=dict(color='rgb(156, 163, 175)', width=2, dash='dash'),
-        fillcolor='rgba(156, 163, 175, 0.1)'
-    ))
-
-    fig_radar.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100],
-                tickfont=dict(size=12, color='#1f2937'),
-                gridcolor='rgba(0,0,0,0.1)'
-            ),
-            angularaxis=dict(
-                tickfont=dict(size=14, color='#1e40af')
-            ),
-            bgcolor='rgba(255,255,255,0.9)'
-        ),
-        showlegend=True,
-        legend=dict(
-            x=0.5,
-            y=-0.1,
-            xanchor='center',
-            orientation='h',
-            font=dict(size=12, color='#1f2937')
-        ),
-        height=500,
-        paper_bgcolor='#ffffff',
-        plot_bgcolor='#ffffff'
-    )
+# TAB 2: Map View
+def render_map_view():
+    st.markdown(f"## 🗺️ {region_name} - Geographic View")
 
-    st.plotly_chart(fig_radar, use_container_width=True)
+    cluster_markers = st.toggle(
+        "Cluster dense markers", value=False, key='map_cluster',
+        help="Group nearby zip codes into clusters until you zoom in. Large datasets "
+             "are always sent to the browser as a single GeoJSON layer.")
 
-# TAB 2: Map View
-with tab2:
-    st.markdown("## 🗺️ Middlesex County - Geographic View")
-
-    # Create map centered on selected zip
-    m = folium.Map(
-        location=[selected_data['latitude'], selected_data['longitude']],
-        zoom_start=11,
-        tiles='CartoDB positron'
-    )
+    # Cached base layer with every marker, re-centred on the selected zip by a small overlay
+    with profiler.section('map build'):
+        base_map_html, map_name = base_map(df, score_version, weights, cluster_markers)
+        map_html = add_selection_overlay(base_map_html, map_name, selected_data)
+    with profiler.section('map render'):
+        st.iframe(map_html, height=600)
 
-    # Add markers for all zips
-    for idx, row in df.iterrows():
-        score = row['livability_score']
-        is_selected = (str(row['zip_code']) == str(selected_zip))
-
-        if score >= 75:
-            color = '#10b981'
-        elif score >= 60:
-            color = '#3b82f6'
-        elif score >= 45:
-            color = '#f59e0b'
-        else:
-            color = '#ef4444'
-
-        popup_html = f"""
-        <div style="font-family: Arial; font-size: 13px; width: 220px;">
-            <h4 style="margin: 5px 0; color: {color};">{row['city']}, MA {row['zip_code']}</h4>
-            <b style="font-size: 16px;">Livability: {score:.1f}/100</b>
-            <hr style="margin: 8px 0;">
-            <table style="width: 100%; font-size: 12px;">
-                <tr><td>🛡️ Safety:</td><td><b>{row['crime_score']:.1f}</b></td></tr>
-                <tr><td>🎓 Education:</td><td><b>{row['education_score']:.1f}</b></td></tr>
-                <tr><td>💼 Jobs:</td><td><b>{row['jobs_score']:.1f}</b></td></tr>
-                <tr><td>🏠 Housing:</td><td><b>{row['housing_score']:.1f}</b></td></tr>
-                <tr><td>🚗 Transport:</td><td><b>{row['transportation_score']:.1f}</b></td></tr>
-            </table>
-        </div>
-        """
-
-        folium.CircleMarker(
-            location=[row['latitude'], row['longitude']],
-            radius=15 if is_selected else 8,
-            popup=folium.Popup(popup_html, max_width=300),
-            tooltip=f"{row['city']} ({row['zip_code']}): {score:.1f}",
-            color='#fbbf24' if is_selected else color,
-            fill=True,
-            fillColor='#fbbf24' if is_selected else color,
-            fillOpacity=0.9 if is_selected else 0.7,
-            weight=4 if is_selected else 2
-        ).add_to(m)
-
-    # Add legend
-    legend_html = """
-    <div style="position: fixed; bottom: 50px; left: 50px; z-index: 1000; 
-                background-color: white; padding: 15px; border-radius: 10px;
-                border: 2px solid #ccc; font-size: 14px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
-        <h4 style="margin: 0 0 10px 0; color: #1e40af;">Livability Score</h4>
-        <div><span style="color: #10b981; font-size: 20px;">●</span> Excellent (75-100)</div>
-        <div><span style="color: #3b82f6; font-size: 20px;">●</span> Good (60-74)</div>
-        <div><span style="color: #f59e0b; font-size: 20px;">●</span> Average (45-59)</div>
-        <div><span style="color: #ef4444; font-size: 20px;">●</span> Below Average (&lt;45)</div>
-        <hr style="margin: 10px 0;">
-        <div><span style="color: #fbbf24; font-size: 20px;">⭐</span> <b>Selected Zip Code</b></div>
-    </div>
-    """
-    m.get_root().html.add_child(folium.Element(legend_html))
+    render_nearby()
 
-    st_folium(m, width=1200, height=600, returned_objects=[])
 
-    # Nearby zip codes
+# Nearby zip codes - a fragment, so the count/radius controls rerun only this section
+@profiled_fragment
+def render_nearby():
     st.markdown("---")
     st.markdown("### 📍 Nearby Zip Codes Comparison")
 
-    # Calculate distances
-    df_temp = df.copy()
-    df_temp['distance'] = ((df_temp['latitude'] - selected_data['latitude'])**2 +
-                           (df_temp['longitude'] - selected_data['longitude'])**2)**0.5
+    col1, col2 = st.columns(2)
+    with col1:
+        n_nearby = st.slider("Number of nearby zip codes:", 1, 12, 6,
+                             key='nearby_count')
+    with col2:
+        radius = st.select_slider("Search radius (miles):",
+                                  ['Any', 1, 2, 5, 10, 25, 50],
+                                  value='Any', key='nearby_radius')
 
-    nearby = df_temp[df_temp['zip_code'] !=
-                     selected_zip].nsmallest(6, 'distance')
+    # Great-circle neighbours from the cached spatial index
+    nearby_pos, nearby_miles = get_spatial_index(data_version, df).nearest(
+        selected_pos, n_nearby, radius_miles=None if radius == 'Any' else radius)
+    nearby = df.iloc[nearby_pos]
 
     if len(nearby) > 0:
         cols = st.columns(3)
         for i, (idx, row) in enumerate(nearby.iterrows()):
             with cols[i % 3]:
-                rating, color, emoji = interpret_score(row['livability_score'])
+                rating, color = row['livability_score_label'], row['livability_score_color']
                 st.markdown(f"""
                 <div style='background: white; padding: 15px; border-radius: 10px; 
                             border-left: 5px solid {color}; box-shadow: 0 4px 8px rgba(0,0,0,0.1);
@@ -952,135 +932,95 @@ with tab2:
                     <h4 style='margin: 0 0 10px 0; color: #1e40af !important;'>{row['zip_code']} - {row['city']}</h4>
                     <div style='font-size: 28px; font-weight: 700; color: {color} !important;'>{row['livability_score']:.1f}</div>
                     <div style='font-size: 14px; color: #6b7280 !important;'>{rating}</div>
+                    <div style='font-size: 12px; color: #9ca3af !important;'>{nearby_miles[i]:.1f} miles away</div>
                 </div>
                 """, unsafe_allow_html=True)
-
-# TAB 3: Comparisons
-with tab3:
-    st.markdown("## 📊 Compare Zip Codes in Middlesex County")
-
-    # Multi-select for comparison
+    else:
+        st.info(f"No zip codes within {radius} miles of {selected_zip}")
+
+
+# Display formats for the comparison table; the values underneath stay numeric
+COMPARISON_TABLE_CONFIG = {
+    **{header: st.column_config.NumberColumn(header, format='%.1f')
+       for header in ['Overall', 'Safety', 'Education', 'Jobs', 'Housing', 'Transport']},
+    'Med. Income': st.column_config.NumberColumn('Med. Income', format='$%,d'),
+    'Med. Home Value': st.column_config.NumberColumn('Med. Home Value', format='$%,d'),
+    'Population': st.column_config.NumberColumn('Population', format='%,d'),
+}
+
+
+# TAB 3: Comparisons - a fragment, so changing the comparison set reruns only this tab
+@profiled_fragment
+def render_comparisons():
+    st.markdown(f"## 📊 Compare Zip Codes in {region_name}")
+
+    # Multi-select for comparison - like the zip picker, only the chosen zips and the
+    # best matches of the search reach the browser, not every label in the region
+    query = st.text_input("Search zip codes to compare:", placeholder="e.g. 0185 or Lowell",
+                          key='compare_search')
+    selected_label = zip_options.labels[selected_pos]
+    chosen = [label for label in st.session_state.get('compare_zips', []) if label != selected_label]
+    st.session_state['compare_zips'] = chosen
+    options, n_matches = zip_options.comparison_options(zip_options.search(query), selected_pos, chosen)
     comparison_zips = st.multiselect(
         "Select zip codes to compare (up to 5):",
-        [f"{row['zip_code']} - {row['city']}" for _,
-            row in df.iterrows() if str(row['zip_code']) != str(selected_zip)],
-        default=[],
-        max_selections=5
+        options,
+        max_selections=5,
+        key='compare_zips'
     )
+    if n_matches > MAX_OPTIONS:
+        st.caption(f"Listing the top {MAX_OPTIONS} of {n_matches:,} zip codes by livability - "
+                   f"search to narrow down")
 
     if comparison_zips:
-        comparison_zip_codes = [str(z.split(" - ")[0])
-                                for z in comparison_zips]
-        comparison_df = df[df['zip_code'].isin(
-            [selected_zip] + comparison_zip_codes)]
-
-        # Bar charts for each variable
-        col1, col2 = st.columns(2)
-
-        variables_to_plot = [
-            ('crime_score', 'Safety Score', '🛡️'),
-            ('education_score', 'Education Score', '🎓'),
-            ('jobs_score', 'Jobs Score', '💼'),
-            ('housing_score', 'Housing Score', '🏠'),
-            ('transportation_score', 'Transportation Score', '🚗'),
-            ('livability_score', 'Overall Livability', '⭐')
-        ]
-
-        for i, (col_name, title, emoji) in enumerate(variables_to_plot):
-            with col1 if i % 2 == 0 else col2:
-                fig = px.bar(
-                    comparison_df,
-                    x='zip_code',
-                    y=col_name,
-                    color=col_name,
-                    title=f"{emoji} {title}",
-                    labels={'zip_code': 'Zip Code', col_name: 'Score'},
-                    color_continuous_scale='RdYlGn',
-                    range_color=[0, 100]
-                )
-                fig.update_layout(
-                    height=300,
-                    showlegend=False,
-                    paper_bgcolor='#ffffff',
-                    plot_bgcolor='#ffffff',
-                    font=dict(color='#1f2937')
-                )
-                fig.update_traces(
-                    marker_line_color='rgb(8,48,107)',
-                    marker_line_width=1.5
-                )
-                st.plotly_chart(fig, use_container_width=True)
-
-        # Comparison table
+        comparison_zip_codes = [label_zip(z) for z in comparison_zips]
+        comparison_df = df.iloc[sorted(
+            zip_index[z] for z in [selected_zip] + comparison_zip_codes)]
+
+        # One faceted bar chart with a panel per score
+        with profiler.section('chart comparison bars'):
+            fig = comparison_figure(comparison_df, score_version, weights)
+            st.plotly_chart(fig, width='stretch')
+
+        # Comparison table - numeric columns formatted by the browser, so they sort as numbers
         st.markdown("### 📋 Detailed Comparison Table")
-        comp_table = comparison_df[[
-            'zip_code', 'city', 'livability_score', 'crime_score',
-            'education_score', 'jobs_score', 'housing_score', 'transportation_score',
-            'median_income', 'median_home_value', 'population'
-        ]].copy()
-
-        comp_table.columns = ['Zip', 'City', 'Overall', 'Safety', 'Education',
-                              'Jobs', 'Housing', 'Transport', 'Med. Income',
-                              'Med. Home Value', 'Population']
-
-        # Format numbers
-        comp_table['Med. Income'] = comp_table['Med. Income'].apply(
-            lambda x: f"${int(x):,}")
-        comp_table['Med. Home Value'] = comp_table['Med. Home Value'].apply(
-            lambda x: f"${int(x):,}")
-        comp_table['Population'] = comp_table['Population'].apply(
-            lambda x: f"{int(x):,}")
-
-        # Round scores
-        for col in ['Overall', 'Safety', 'Education', 'Jobs', 'Housing', 'Transport']:
-            comp_table[col] = comp_table[col].round(1)
-
-        st.dataframe(comp_table, use_container_width=True, hide_index=True)
+        st.dataframe(comparison_table(comparison_df, score_version, weights),
+                     width='stretch', hide_index=True,
+                     column_config=COMPARISON_TABLE_CONFIG)
     else:
         st.info("👆 Select zip codes above to see detailed comparisons")
 
+
 # TAB 4: Rankings
-with tab4:
-    st.markdown("## 🏆 Middlesex County Rankings")
+# The selected zip is flagged by a boolean column rather than per-row styling
+SELECTED_COLUMN = {'Selected': st.column_config.CheckboxColumn("📍", help="Selected zip code")}
+
+
+def render_rankings():
+    st.markdown(f"## 🏆 {region_name} Rankings")
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("### 🌟 Top 10 Zip Codes")
-        top10 = df.nlargest(10, 'livability_score')[
-            ['zip_code', 'city', 'livability_score']
-        ].copy()
-        top10['Rank'] = range(1, len(top10) + 1)
-        top10.columns = ['Zip', 'City', 'Score', 'Rank']
-        top10 = top10[['Rank', 'Zip', 'City', 'Score']]
-        top10['Score'] = top10['Score'].round(1)
-
-        # Highlight if selected zip is in top 10
-        def highlight_selected(row):
-            if str(row['Zip']) == str(selected_zip):
-                return ['background-color: #fef3c7'] * len(row)
-            return [''] * len(row)
+        top10 = rank_table(df, score_version, weights)
 
         st.dataframe(
-            top10.style.apply(highlight_selected, axis=1),
-            use_container_width=True,
-            hide_index=True
+            top10.assign(Selected=top10['Zip'] == selected_zip),
+            width='stretch',
+            hide_index=True,
+            column_config=SELECTED_COLUMN
         )
 
     with col2:
         st.markdown("### ⚠️ Bottom 10 Zip Codes")
-        bottom10 = df.nsmallest(10, 'livability_score')[
-            ['zip_code', 'city', 'livability_score']
-        ].copy()
-        bottom10['Rank'] = range(len(df), len(df) - len(bottom10), -1)
-        bottom10.columns = ['Zip', 'City', 'Score', 'Rank']
-        bottom10 = bottom10[['Rank', 'Zip', 'City', 'Score']]
-        bottom10['Score'] = bottom10['Score'].round(1)
+        bottom10 = rank_table(df, score_version, weights, largest=False)
 
         st.dataframe(
-            bottom10.style.apply(highlight_selected, axis=1),
-            use_container_width=True,
-            hide_index=True
+            bottom10.assign(Selected=bottom10['Zip'] == selected_zip),
+            width='stretch',
+            hide_index=True,
+            column_config=SELECTED_COLUMN
         )
 
     # Category rankings
@@ -1098,7 +1038,7 @@ with tab4:
     ]
 
     for score_col, name, emoji, col in categories:
-        rank = (df[score_col] > selected_data[score_col]).sum() + 1
+        rank = selected_data[f'{score_col}_rank']
         with col:
             st.markdown(f"""
             <div style='background: white; padding: 15px; border-radius: 10px; 
@@ -1111,14 +1051,149 @@ with tab4:
             </div>
             """, unsafe_allow_html=True)
 
-# TAB 5: Interpretations Guide
-with tab5:
+    render_leaderboard()
+
+
+def reset_leaderboard_page():
+    st.session_state.pop('leaderboard_page', None)
+
+
+def jump_to_zip(order, pos, page_size):
+    st.session_state['leaderboard_page'] = page_of(order, pos, page_size) + 1
+
+
+# Full leaderboard - a fragment, so paging and re-sorting rerun only this section.
+# Pages are slices of a cached sort order per score column and direction
+@profiled_fragment
+def render_leaderboard():
+    st.markdown("---")
+    st.markdown("### 📋 Full Leaderboard")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_col = st.selectbox("Sort by:", list(SORT_COLUMNS), format_func=SORT_COLUMNS.get,
+                                key='leaderboard_sort', on_change=reset_leaderboard_page)
+    with col2:
+        descending = st.radio("Order:", ["Best first", "Worst first"], horizontal=True,
+                              key='leaderboard_order',
+                              on_change=reset_leaderboard_page) == "Best first"
+    with col3:
+        page_size = st.selectbox("Rows per page:", PAGE_SIZES, key='leaderboard_page_size',
+                                 on_change=reset_leaderboard_page)
+
+    order = sort_order(df, score_version, weights, sort_col, descending)
+    n_pages = page_count(len(df), page_size)
+    # A smaller region or larger page may leave fewer pages than before
+    st.session_state['leaderboard_page'] = min(st.session_state.get('leaderboard_page', 1), n_pages)
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        page = st.number_input(f"Page (of {n_pages:,}):", min_value=1, max_value=n_pages,
+                               key='leaderboard_page')
+    with col2:
+        st.button(f"📍 Go to {selected_zip}", on_click=jump_to_zip,
+                  args=(order, selected_pos, page_size), width='stretch')
+
+    table = leaderboard_page(df, order, sort_col, page - 1, page_size, selected_pos)
+    start = (page - 1) * page_size
+    st.caption(f"Zip codes {start + 1:,}-{start + len(table):,} of {len(df):,}, "
+               f"by {SORT_COLUMNS[sort_col]} score")
+    st.dataframe(table, width='stretch', hide_index=True, column_config=SELECTED_COLUMN)
+
+
+# TAB 5: Find Zips - range filters and "zips like this", a fragment so filter
+# changes rerun only this tab. Queries run against cached sorted indexes and a
+# KD-tree over the sub-scores
+RESULT_LIMIT = 100
+
+
+def filter_bounds(col):
+    # None when the column has nothing a slider could range over
+    bounds = get_query_engine(score_version, weights, df).bounds(col)
+    if bounds is None or not np.isfinite(bounds).all():
+        return None
+    lo, hi = bounds
+    if pd.api.types.is_integer_dtype(df[col]):
+        return int(lo), int(hi)
+    return float(np.floor(lo * 10) / 10), float(np.ceil(hi * 10) / 10)
+
+
+@profiled_fragment
+def render_finder():
+    st.markdown(f"## 🔎 Find Zip Codes in {region_name}")
+    engine = get_query_engine(score_version, weights, df)
+
+    filter_cols = st.multiselect("Filter on:", list(FILTER_COLUMNS), format_func=FILTER_COLUMNS.get,
+                                 key='filter_columns')
+    ranges = {}
+    cols = st.columns(2)
+    for i, col in enumerate(filter_cols):
+        bounds = filter_bounds(col)
+        if bounds is None or bounds[0] == bounds[1]:
+            # st.slider needs min < max; a column with one value has nothing to filter
+            with cols[i % 2]:
+                st.caption(f"{FILTER_COLUMNS[col]}: " + (
+                    "no values to filter on" if bounds is None
+                    else f"{bounds[0]:,} for every zip code"))
+            continue
+        lo, hi = bounds
+        key = f'filter_{col}'
+        # New weights move the overall score bounds; a range outside them starts over
+        saved = st.session_state.get(key)
+        if saved is not None and (saved[0] < lo or saved[1] > hi):
+            del st.session_state[key]
+        with cols[i % 2]:
+            value = st.slider(FILTER_COLUMNS[col], lo, hi, (lo, hi), key=key)
+        if value != (lo, hi):
+            ranges[col] = value
+
+    positions = engine.filter(ranges)
+    similar = st.toggle(f"Most similar to {selected_zip} ({selected_data['city']})",
+                        key='similar_to_selected',
+                        help="Nearest zip codes by their five sub-scores")
+
+    if similar:
+        k = st.slider("Number of similar zip codes:", 1, 50, 10, key='similar_count')
+        index = get_similarity_index(score_version, df)
+        shown, distances = index.similar(selected_pos, k, positions if ranges else None)
+        if index.has_scores(selected_pos):
+            st.caption(f"{len(positions):,} of {len(df):,} zip codes match the filters; "
+                       f"closest first by score profile (distance in score points)")
+        else:
+            st.caption(f"{selected_zip} is missing a sub-score, so it has no score profile "
+                       f"to compare against")
+    else:
+        shown, distances = engine.best(positions, RESULT_LIMIT), None
+        st.caption(f"{len(positions):,} of {len(df):,} zip codes match the filters; "
+                   f"the best {len(shown):,} by overall score")
+
+    if len(shown) > 0:
+        st.dataframe(result_table(df, shown, filter_cols, distances),
+                     width='stretch', hide_index=True)
+    elif not similar or index.has_scores(selected_pos):
+        st.info("No zip codes match these filters")
+
+    # Every match, not only the rows shown, with unformatted values. The file is
+    # streamed chunk by chunk when the button is clicked, never on a rerun
+    col1, col2 = st.columns([1, 2], vertical_alignment='bottom')
+    with col1:
+        fmt = st.selectbox("Export format:", list(EXPORT_FORMATS), format_func=str.upper,
+                           key='export_format')
+    with col2:
+        st.download_button(f"⬇️ Export {len(positions):,} matching zip codes",
+                           data=partial(export_bytes, df, positions, fmt),
+                           file_name=f"{region['id']}_zips.{fmt}", mime=EXPORT_FORMATS[fmt],
+                           on_click='ignore', width='stretch')
+
+
+# TAB 6: Interpretations Guide
+def render_interpretations():
     st.markdown("## 📚 Understanding the Scores")
 
-    st.markdown("""
+    st.markdown(f"""
     ### 🎯 What Do These Scores Actually Mean?
     
-    This guide helps you understand what each score tells you about quality of life in Middlesex County.
+    This guide helps you understand what each score tells you about quality of life in {region_name}.
     """)
 
     st.markdown("---")
@@ -1133,11 +1208,10 @@ with tab5:
     - **50-64**: ⚠️ **Average** - Typical quality of life. Mix of strengths and weaknesses.
     - **Below 50**: ❌ **Needs Improvement** - Below-average quality of life. Significant challenges in multiple areas.
     
-    **Your score of {:.1f}** means this zip code ranks **#{} out of {}** in Middlesex County.
+    **Your score of {:.1f}** means this zip code ranks **#{} out of {}** in {}.
     """.format(selected_data['livability_score'],
-               (df['livability_score'] >
-                selected_data['livability_score']).sum() + 1,
-               len(df)))
+               selected_data['livability_score_rank'],
+               len(df), region_name))
 
     st.markdown("---")
 
@@ -1236,11 +1310,30 @@ with tab5:
     **Remember:** No single score tells the whole story. Consider your personal priorities and visit areas in person!
     """)
 
+
+TABS = [
+    ("📊 Detailed Analysis", render_detailed_analysis),
+    ("🗺️ Map View", render_map_view),
+    ("📈 Comparisons", render_comparisons),
+    ("📉 Rankings", render_rankings),
+    ("🔎 Find Zips", render_finder),
+    ("📚 Interpretations", render_interpretations),
+]
+
+# Switching tabs reruns the script with the new tab open; hidden tabs do no work
+tab_containers = st.tabs([label for label, _ in TABS], key='main_tabs',
+                         on_change='rerun')
+for tab, (label, render_tab) in zip(tab_containers, TABS):
+    with tab:
+        if tab.open:
+            with profiler.section(f'tab {label}'):
+                render_tab()
+
 # Footer
 st.markdown("---")
 st.markdown(f"""
 <div style='text-align: center; padding: 20px; font-size: 14px; background: white; border-radius: 10px; border: 1px solid #e5e7eb;'>
-    <p style='color: #1f2937 !important; font-weight: 600; margin: 0;'><b>Middlesex County Livability Analysis Dashboard</b></p>
+    <p style='color: #1f2937 !important; font-weight: 600; margin: 0;'><b>{region_name} Livability Analysis Dashboard</b></p>
     <p style='color: #4b5563 !important; margin: 10px 0;'>Currently viewing: Zip Code <b>{selected_zip}</b> ({selected_data['city']})</p>
     <p style='color: #6b7280 !important; margin: 10px 0;'>Data Sources: U.S. Census Bureau ACS 2022 (5-year estimates) | FBI UCR | Mass DOE | BLS</p>
     <p style='color: #6b7280 !important; margin: 10px 0;'>Created by Sushmitha | Northeastern University | Data Visualization Project | December 2024</p>
@@ -1250,3 +1343,27 @@ st.markdown(f"""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+
+# Profiling panel - this rerun's breakdown plus the totals of recent reruns
+if profiler.enabled:
+    profile = profiler.report(region=region['id'], tab=st.session_state.get('main_tabs'),
+                              selected_zip=selected_zip)
+    profiler.stop()
+    history = record_profile(profile)
+
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("### ⏱️ Rerun Profile")
+        rss = f" | RSS {profile['rss_mb']:.0f} MB" if profile['rss_mb'] is not None else ""
+        st.caption(f"{profile['total_ms']:.0f} ms this rerun, {profile['unprofiled_ms']:.0f} ms "
+                   f"outside named sections{rss}")
+        sections = pd.DataFrame({
+            'Section': ['\u2003' * s['depth'] + s['name'] for s in profile['sections']],
+            'ms': [round(s['ms'], 1) for s in profile['sections']],
+        })
+        if profiler.mode == 'memory':
+            sections['alloc KB'] = [round(s.get('alloc_kb', 0), 1) for s in profile['sections']]
+        st.dataframe(sections, hide_index=True, width='stretch')
+        st.caption(f"Total ms, last {len(history)} reruns")
+        st.line_chart(pd.DataFrame({'total ms': history}), height=120)
@@ -0,0 +1,164 @@
+"""
+Zip code data store - columnar Feather snapshot of the source CSV
+The snapshot is built once with explicit dtypes and memory-mapped on later loads,
+and is rebuilt whenever the CSV's modification time and content hash change
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+DATA_FILE = 'middlesex_data_real.csv'
+SNAPSHOT_DIR = os.path.join('.cache', 'snapshots')
+
+# Bump when COLUMN_DTYPES or the snapshot layout changes
+SNAPSHOT_VERSION = 2
+
+ZIP_WIDTH = 5
+
+# Counts and dollar amounts are nullable: census files suppress values for small
+# areas, and a blank must load as missing rather than fail the whole file. Without
+# blanks such a column still reaches numpy as int32; with them, as float64 with NaN
+COLUMN_DTYPES = {
+    'zip_code': 'str',
+    'city': 'category',
+    'median_income': 'Int32',
+    'pct_bachelors_plus': 'float32',
+    'unemployment_rate': 'float32',
+    'median_home_value': 'Int32',
+    'housing_burden': 'float32',
+    'mean_commute_time': 'float32',
+    'crime_rate': 'float32',
+    'population': 'Int32',
+    'latitude': 'float32',
+    'longitude': 'float32',
+    'education_index': 'float32',
+    'transportation_index': 'float32',
+}
+
+
+def fix_zip_codes(df):
+    if 'zip_code' in df:
+        df['zip_code'] = df['zip_code'].astype(str).str.zfill(ZIP_WIDTH)
+    return df
+
+
+def read_csv(path):
+    return fix_zip_codes(pd.read_csv(path, dtype=COLUMN_DTYPES))
+
+
+def read_parquet(path):
+    # Parquet carries its own types; only the zip code width needs fixing up
+    return fix_zip_codes(pd.read_parquet(path))
+
+
+def iter_chunks(path, chunksize, columns=None):
+    """Stream a CSV or Parquet file as frames of at most chunksize rows with the store's dtypes."""
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield fix_zip_codes(batch.to_pandas())
+        return
+    for chunk in pd.read_csv(path, dtype=COLUMN_DTYPES, chunksize=chunksize, usecols=columns):
+        yield fix_zip_codes(chunk)
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_paths(csv_path, snapshot_dir=SNAPSHOT_DIR):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    base = os.path.join(snapshot_dir, name)
+    return base + '.feather', base + '.json'
+
+
+def _source_stat(csv_path):
+    stat = os.stat(csv_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _tmp_path(path):
+    # Unique per process, so concurrent builders of one snapshot never share a temp file
+    return f'{path}.{os.getpid()}.tmp'
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = _tmp_path(meta_path)
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def snapshot_is_fresh(csv_path, snapshot_dir=SNAPSHOT_DIR):
+    """True if the snapshot matches the CSV; a touched but unchanged CSV only costs a hash."""
+    snapshot_path, meta_path = snapshot_paths(csv_path, snapshot_dir)
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get('version') != SNAPSHOT_VERSION or not os.path.exists(snapshot_path):
+        return False
+
+    stat = _source_stat(csv_path)
+    if stat['mtime_ns'] == meta['mtime_ns'] and stat['size'] == meta['size']:
+        return True
+    if file_hash(csv_path) != meta['sha1']:
+        return False
+
+    _write_meta(meta_path, {**meta, **stat})
+    return True
+
+
+def build_snapshot(csv_path, snapshot_dir=SNAPSHOT_DIR):
+    snapshot_path, meta_path = snapshot_paths(csv_path, snapshot_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    stat = _source_stat(csv_path)
+    df = read_csv(csv_path)
+
+    tmp_path = _tmp_path(snapshot_path)
+    feather.write_feather(df, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, snapshot_path)
+    _write_meta(meta_path, {'version': SNAPSHOT_VERSION, 'sha1': file_hash(csv_path), **stat})
+    return df
+
+
+def read_snapshot(snapshot_path):
+    # Uncompressed Arrow IPC maps straight into numeric columns without a copy
+    table = feather.read_table(snapshot_path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def load_dataset(csv_path=DATA_FILE, snapshot_dir=SNAPSHOT_DIR):
+    """Load the zip code table, preferring the memory-mapped snapshot over CSV parsing."""
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+    if csv_path.endswith('.parquet'):
+        return read_parquet(csv_path)
+
+    if snapshot_is_fresh(csv_path, snapshot_dir):
+        return read_snapshot(snapshot_paths(csv_path, snapshot_dir)[0])
+
+    try:
+        return build_snapshot(csv_path, snapshot_dir)
+    except OSError:
+        # Read-only deployments still work, just without the fast path
+        return read_csv(csv_path)
+
+
+def build_zip_index(df):
+    """Map each zip code to its row position for O(1) lookups."""
+    return dict(zip(df['zip_code'], range(len(df))))
@@ -0,0 +1,156 @@
+"""
+Streaming export - scored zips as CSV, Parquet or GeoJSON, encoded chunk by chunk
+Every writer takes an iterable of frames and yields bytes, so at most one chunk
+is ever formatted at a time: files are written as they are produced, and a
+download holds only the finished bytes. Values leave as plain numbers and
+strings - display formatting belongs to the dashboard, never to an export
+"""
+
+import io
+import json
+import math
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_CHUNK_SIZE = 5_000
+
+# Format -> MIME type
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'geojson': 'application/geo+json',
+}
+
+# Colors, emojis and map styling only matter on screen
+DISPLAY_SUFFIXES = ('_color', '_emoji')
+DISPLAY_PREFIXES = ('map_',)
+
+
+def export_columns(df):
+    return [col for col in df.columns
+            if not col.endswith(DISPLAY_SUFFIXES) and not col.startswith(DISPLAY_PREFIXES)]
+
+
+def plain_strings(chunk):
+    """Categoricals as plain strings; chunks would otherwise carry different dictionaries."""
+    categorical = chunk.select_dtypes('category').columns
+    return chunk.astype({col: str for col in categorical})
+
+
+def frame_chunks(df, positions=None, chunksize=EXPORT_CHUNK_SIZE):
+    """The export columns of df, or of its rows at positions, as frames of at most chunksize rows."""
+    columns = export_columns(df)
+    n_rows = len(df) if positions is None else len(positions)
+    # An empty selection still yields one chunk, for the CSV header and Parquet schema
+    for start in range(0, max(n_rows, 1), chunksize):
+        rows = slice(start, start + chunksize) if positions is None else positions[start:start + chunksize]
+        yield plain_strings(df.iloc[rows][columns])
+
+
+def csv_stream(chunks):
+    for i, chunk in enumerate(chunks):
+        yield chunk.to_csv(index=False, header=i == 0).encode()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose contents are taken out as they arrive."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def parquet_stream(chunks):
+    """One row group per chunk, each yielded as soon as it is written."""
+    sink = _Drain()
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            yield sink.take()
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.take()
+
+
+def _shortest_floats(chunk):
+    # float32 columns as the float64 of their shortest repr, so 72.3 is not written as 72.3000030518
+    float32 = chunk.select_dtypes(np.float32).columns
+    return chunk.astype({col: str for col in float32}).astype({col: np.float64 for col in float32})
+
+
+def _point(lon, lat):
+    # A zip without coordinates is still a feature, just one without a geometry
+    if not (math.isfinite(lon) and math.isfinite(lat)):
+        return 'null'
+    return f'{{"type":"Point","coordinates":{json.dumps([lon, lat], separators=(",", ":"))}}}'
+
+
+def geojson_stream(chunks):
+    """A FeatureCollection of points with every other column as properties."""
+    yield b'{"type":"FeatureCollection","features":['
+    first = True
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        chunk = _shortest_floats(chunk)
+        lons = chunk['longitude'].to_numpy(dtype=np.float64).tolist()
+        lats = chunk['latitude'].to_numpy(dtype=np.float64).tolist()
+        properties = chunk.drop(columns=['latitude', 'longitude']).to_json(
+            orient='records', lines=True, double_precision=15).splitlines()
+        features = ','.join(
+            f'{{"type":"Feature","geometry":{_point(lon, lat)},"properties":{props}}}'
+            for lon, lat, props in zip(lons, lats, properties))
+        yield (features if first else ',' + features).encode()
+        first = False
+    yield b']}'
+
+
+EXPORT_STREAMS = {'csv': csv_stream, 'parquet': parquet_stream, 'geojson': geojson_stream}
+
+
+def write_export(chunks, output_path, fmt):
+    """Stream chunks into output_path, swapped in only once complete."""
+    if fmt not in EXPORT_STREAMS:
+        raise ValueError(f"Unsupported export format: {fmt!r} (expected one of {list(EXPORT_FORMATS)})")
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            for data in EXPORT_STREAMS[fmt](chunks):
+                f.write(data)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path
+
+
+def export_bytes(df, positions=None, fmt='csv', chunksize=EXPORT_CHUNK_SIZE):
+    """The whole export in memory, for a download button; only the output is ever held in full."""
+    buffer = io.BytesIO()
+    for data in EXPORT_STREAMS[fmt](frame_chunks(df, positions, chunksize)):
+        buffer.write(data)
+    return buffer
@@ -0,0 +1,165 @@
+"""
+Interpretation layer - declarative bin tables for score and metric labels
+Whole columns are labeled in one np.digitize pass; the scalar interpret_* helpers
+used by the dashboard read the same tables so the displayed text stays identical
+"""
+
+import numpy as np
+import pandas as pd
+
+# Each table lists ascending edges and one entry per bin (len(edges) + 1).
+# right=False: a value moves up a bin once it is >= the edge (higher is better)
+# right=True:  a value stays in a bin while it is <= the edge (lower is better)
+
+SCORE_BINS = {
+    'edges': [50, 65, 80],
+    'right': False,
+    'labels': ["Needs Improvement", "Average", "Good", "Excellent"],
+    'colors': ["#ef4444", "#f59e0b", "#3b82f6", "#10b981"],
+    'emojis': ["❌", "⚠️", "✅", "🌟"],
+}
+
+# Map markers use their own, slightly looser livability bands
+MAP_SCORE_BINS = {
+    'edges': [45, 60, 75],
+    'right': False,
+    'labels': ["Below Average", "Average", "Good", "Excellent"],
+    'colors': ['#ef4444', '#f59e0b', '#3b82f6', '#10b981'],
+}
+
+INCOME_BINS = {
+    'edges': [50000, 75000, 100000, 150000],
+    'right': False,
+    'labels': ["Lower Income - Economic challenges present",
+               "Middle Income - Moderate economic status",
+               "Upper Middle Income - Comfortable living",
+               "High Income - Above average prosperity",
+               "Very High Income - Top tier economic status"],
+}
+
+EDUCATION_BINS = {
+    'edges': [30, 45, 60, 75],
+    'right': False,
+    'labels': ["Low Education - Significant educational gaps",
+               "Lower Education - Below average attainment",
+               "Moderately Educated - Average education levels",
+               "Well Educated - Above average educational attainment",
+               "Highly Educated - Strong intellectual capital"],
+}
+
+UNEMPLOYMENT_BINS = {
+    'edges': [2.5, 4.0, 6.0],
+    'right': True,
+    'labels': ["Excellent Job Market - Very low unemployment",
+               "Strong Job Market - Healthy employment",
+               "Moderate Job Market - Average unemployment",
+               "Weak Job Market - High unemployment challenges"],
+}
+
+HOUSING_BINS = {
+    'edges': [28, 32, 38],
+    'right': True,
+    'labels': ["Very Affordable - Low housing cost burden",
+               "Affordable - Manageable housing costs",
+               "Moderately Expensive - Above average costs",
+               "Expensive - High housing cost burden"],
+}
+
+COMMUTE_BINS = {
+    'edges': [23, 27, 32],
+    'right': True,
+    'labels': ["Excellent - Very short commute",
+               "Good - Reasonable commute time",
+               "Average - Typical commute duration",
+               "Long - Extended commute time"],
+}
+
+CRIME_BINS = {
+    'edges': [7, 12, 18],
+    'right': True,
+    'labels': ["Very Safe - Low crime area",
+               "Safe - Below average crime",
+               "Moderately Safe - Average crime levels",
+               "Higher Crime - Above average crime rates"],
+}
+
+# (source column, bin table, output column prefix)
+LABELED_COLUMNS = [
+    ('crime_score', SCORE_BINS, 'crime_score'),
+    ('education_score', SCORE_BINS, 'education_score'),
+    ('jobs_score', SCORE_BINS, 'jobs_score'),
+    ('housing_score', SCORE_BINS, 'housing_score'),
+    ('transportation_score', SCORE_BINS, 'transportation_score'),
+    ('livability_score', SCORE_BINS, 'livability_score'),
+    ('livability_score', MAP_SCORE_BINS, 'map'),
+    ('median_income', INCOME_BINS, 'median_income'),
+    ('pct_bachelors_plus', EDUCATION_BINS, 'pct_bachelors_plus'),
+    ('unemployment_rate', UNEMPLOYMENT_BINS, 'unemployment_rate'),
+    ('housing_burden', HOUSING_BINS, 'housing_burden'),
+    ('mean_commute_time', COMMUTE_BINS, 'mean_commute_time'),
+    ('crime_rate', CRIME_BINS, 'crime_rate'),
+]
+
+FIELDS = [('labels', 'label'), ('colors', 'color'), ('emojis', 'emoji')]
+
+
+def bin_index(values, bins):
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.digitize(values, bins['edges'], right=bins['right'])
+    if not bins['right']:
+        # NaN fails every >= test in the scalar chains, so it lands in the lowest bin
+        codes[np.isnan(values)] = 0
+    return codes
+
+
+def _take(options, codes):
+    categories, inverse = np.unique(options, return_inverse=True)
+    return pd.Categorical.from_codes(inverse[codes], categories)
+
+
+def label_columns(values, bins, prefix):
+    """Categorical label/color/emoji columns (whichever the table defines) for a whole column."""
+    codes = bin_index(values, bins)
+    return {f'{prefix}_{field}': _take(bins[key], codes)
+            for key, field in FIELDS if key in bins}
+
+
+def add_label_columns(df, sources):
+    labels = {}
+    for source, bins, prefix in LABELED_COLUMNS:
+        if source in sources:
+            labels.update(label_columns(df[source].to_numpy(), bins, prefix))
+    return df.assign(**labels)
+
+
+def _lookup(value, bins):
+    return int(bin_index(np.atleast_1d(value), bins)[0])
+
+
+def interpret_score(score):
+    i = _lookup(score, SCORE_BINS)
+    return SCORE_BINS['labels'][i], SCORE_BINS['colors'][i], SCORE_BINS['emojis'][i]
+
+
+def interpret_income(income):
+    return INCOME_BINS['labels'][_lookup(income, INCOME_BINS)]
+
+
+def interpret_education(pct):
+    return EDUCATION_BINS['labels'][_lookup(pct, EDUCATION_BINS)]
+
+
+def interpret_unemployment(rate):
+    return UNEMPLOYMENT_BINS['labels'][_lookup(rate, UNEMPLOYMENT_BINS)]
+
+
+def interpret_housing(burden):
+    return HOUSING_BINS['labels'][_lookup(burden, HOUSING_BINS)]
+
+
+def interpret_commute(time):
+    return COMMUTE_BINS['labels'][_lookup(time, COMMUTE_BINS)]
+
+
+def interpret_crime(rate):
+    return CRIME_BINS['labels'][_lookup(rate, CRIME_BINS)]
@@ -0,0 +1,44 @@
+"""
+Paginated leaderboard over every zip - pages are slices of a cached sort order
+(artifacts.sort_order), so paging, re-sorting and finding the selected zip's page
+never sort or scan the frame row by row
+"""
+
+import numpy as np
+import pandas as pd
+
+# Score column -> leaderboard header, in display order
+SORT_COLUMNS = {
+    'livability_score': 'Overall',
+    'crime_score': 'Safety',
+    'education_score': 'Education',
+    'jobs_score': 'Jobs',
+    'housing_score': 'Housing',
+    'transportation_score': 'Transport',
+}
+
+PAGE_SIZES = [25, 50, 100]
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def page_of(order, pos, page_size):
+    """Zero-based page holding row pos in the given sort order."""
+    return int(np.flatnonzero(order == pos)[0]) // page_size
+
+
+def leaderboard_page(scored, order, sort_col, page, page_size, selected_pos=None):
+    """Rank/Zip/City/score table for one page, with a Selected flag for the zip at selected_pos."""
+    positions = np.asarray(order[page * page_size:(page + 1) * page_size])
+    rows = scored.iloc[positions]
+    table = {
+        'Rank': rows[f'{sort_col}_rank'].to_numpy(),
+        'Zip': rows['zip_code'].to_numpy(),
+        'City': rows['city'].to_numpy(),
+    }
+    table.update({header: rows[col].to_numpy(dtype=np.float64).round(1)
+                  for col, header in SORT_COLUMNS.items()})
+    table['Selected'] = positions == selected_pos
+    return pd.DataFrame(table)
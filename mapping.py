@@ -0,0 +1,239 @@
+"""
+Folium map builders for the Map View tab
+The base layer (every marker, popup and the legend) depends only on the scored data,
+so it is rendered to HTML once per dataset/weight version; the selected zip is drawn
+on top by a small overlay script that also re-centres the map
+
+Small datasets get one folium.CircleMarker per zip. Above GEOJSON_THRESHOLD rows the
+points are shipped as a single GeoJSON FeatureCollection and styled, popped up and
+optionally clustered in the browser, which keeps the page size close to the raw data
+"""
+
+import json
+
+import folium
+from branca.element import Element, MacroElement
+from folium.elements import JSCSSMixin
+from folium.plugins import MarkerCluster
+from jinja2 import Template
+
+from interpretation import MAP_SCORE_BINS, bin_index
+
+SELECTED_COLOR = '#fbbf24'
+ZOOM_START = 11
+
+# Row count above which the base map switches from per-marker to GeoJSON rendering.
+# Per-marker maps cost about 1.1 ms and 1.8 KB of HTML per zip to build (bench_suite
+# map_build), GeoJSON ones a fraction of that, so markers are kept for small regions only
+GEOJSON_THRESHOLD = 200
+
+# Clusters break apart into individual points from this zoom level on
+CLUSTER_UNTIL_ZOOM = 12
+
+LEGEND_HTML = """
+<div style="position: fixed; bottom: 50px; left: 50px; z-index: 1000;
+            background-color: white; padding: 15px; border-radius: 10px;
+            border: 2px solid #ccc; font-size: 14px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
+    <h4 style="margin: 0 0 10px 0; color: #1e40af;">Livability Score</h4>
+    <div><span style="color: #10b981; font-size: 20px;">●</span> Excellent (75-100)</div>
+    <div><span style="color: #3b82f6; font-size: 20px;">●</span> Good (60-74)</div>
+    <div><span style="color: #f59e0b; font-size: 20px;">●</span> Average (45-59)</div>
+    <div><span style="color: #ef4444; font-size: 20px;">●</span> Below Average (&lt;45)</div>
+    <hr style="margin: 10px 0;">
+    <div><span style="color: #fbbf24; font-size: 20px;">⭐</span> <b>Selected Zip Code</b></div>
+</div>
+"""
+
+SELECTION_SCRIPT = """
+<script>
+    (function() {{
+        var map = {map_name};
+        map.setView([{lat}, {lon}], {zoom});
+        L.circleMarker([{lat}, {lon}], {{
+            radius: 15, color: '{color}', fill: true, fillColor: '{color}',
+            fillOpacity: 0.9, weight: 4
+        }}).bindPopup({popup}, {{maxWidth: 300}}).bindTooltip({tooltip}).addTo(map);
+    }})();
+</script>
+"""
+
+
+# Shared by the Python popups and the client-side GeoJSON popups
+POPUP_TEMPLATE = """
+    <div style="font-family: Arial; font-size: 13px; width: 220px;">
+        <h4 style="margin: 5px 0; color: {color};">{city} ({zip})</h4>
+        <b style="font-size: 16px;">Livability: {score}/100</b>
+        <hr style="margin: 8px 0;">
+        <table style="width: 100%; font-size: 12px;">
+            <tr><td>🛡️ Safety:</td><td><b>{crime}</b></td></tr>
+            <tr><td>🎓 Education:</td><td><b>{education}</b></td></tr>
+            <tr><td>💼 Jobs:</td><td><b>{jobs}</b></td></tr>
+            <tr><td>🏠 Housing:</td><td><b>{housing}</b></td></tr>
+            <tr><td>🚗 Transport:</td><td><b>{transport}</b></td></tr>
+        </table>
+    </div>
+    """
+
+# GeoJSON property name -> scored frame column, for the popup's numeric fields
+POPUP_SCORES = {
+    'score': 'livability_score',
+    'crime': 'crime_score',
+    'education': 'education_score',
+    'jobs': 'jobs_score',
+    'housing': 'housing_score',
+    'transport': 'transportation_score',
+}
+
+
+class RawScript(Element):
+    """Script text emitted verbatim; a plain Element would compile it as a Jinja template."""
+
+    def __init__(self, text):
+        super().__init__()
+        self.text = text
+
+    def render(self, **kwargs):
+        return self.text
+
+
+class GeoJsonPoints(JSCSSMixin, MacroElement):
+    """All zips as one GeoJSON layer, styled by score bucket and popped up client-side."""
+
+    _template = Template(r"""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function() {
+                var styles = {{ this.styles|tojson }};
+                var template = {{ this.popup_template|tojson }};
+                var layer = L.geoJSON({{ this.get_name() }}_data, {
+                    pointToLayer: function(feature, latlng) {
+                        return L.circleMarker(latlng, styles[feature.properties.bucket]);
+                    },
+                    onEachFeature: function(feature, marker) {
+                        var p = feature.properties;
+                        marker.bindTooltip(p.city + ' (' + p.zip + '): ' + p.score.toFixed(1));
+                        marker.bindPopup(function() {
+                            return template.replace(/\{(\w+)\}/g, function(_, key) {
+                                if (key === 'color') { return styles[p.bucket].color; }
+                                return typeof p[key] === 'number' ? p[key].toFixed(1) : p[key];
+                            });
+                        }, {maxWidth: 300});
+                    }
+                });
+                {%- if this.cluster %}
+                var cluster = L.markerClusterGroup({disableClusteringAtZoom: {{ this.cluster_until_zoom }}});
+                cluster.addLayer(layer);
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+                {%- else %}
+                layer.addTo({{ this._parent.get_name() }});
+                return layer;
+                {%- endif %}
+            })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, df, cluster=False, cluster_until_zoom=CLUSTER_UNTIL_ZOOM):
+        super().__init__()
+        self._name = 'GeoJsonPoints'
+        self.data = geojson_payload(df)
+        self.styles = [{'color': color, 'fillColor': color, 'fill': True,
+                        'fillOpacity': 0.7, 'weight': 2, 'radius': 8}
+                       for color in MAP_SCORE_BINS['colors']]
+        self.popup_template = POPUP_TEMPLATE
+        self.cluster = cluster
+        self.cluster_until_zoom = cluster_until_zoom
+        self.default_js = MarkerCluster.default_js if cluster else []
+        self.default_css = MarkerCluster.default_css if cluster else []
+
+    def render(self, **kwargs):
+        # The multi-megabyte payload goes in its own raw script, ahead of the layer script
+        self.get_root().script.add_child(
+            RawScript(f"var {self.get_name()}_data = {self.data};"),
+            name=self.get_name() + '_data')
+        super().render(**kwargs)
+
+
+def geojson_payload(df):
+    """Compact FeatureCollection JSON, safe to inline in a script tag."""
+    buckets = bin_index(df['livability_score'].to_numpy(), MAP_SCORE_BINS)
+    lons = df['longitude'].to_numpy(dtype=float).round(5).tolist()
+    lats = df['latitude'].to_numpy(dtype=float).round(5).tolist()
+    columns = {key: df[col].to_numpy(dtype=float).round(1).tolist()
+               for key, col in POPUP_SCORES.items()}
+    keys = list(columns)
+
+    features = [
+        {'type': 'Feature',
+         'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+         'properties': {'zip': zip_code, 'city': city, 'bucket': bucket,
+                        **dict(zip(keys, values))}}
+        for lon, lat, zip_code, city, bucket, *values in zip(
+            lons, lats, df['zip_code'].astype(str), df['city'].astype(str),
+            buckets.tolist(), *columns.values())
+    ]
+    payload = json.dumps({'type': 'FeatureCollection', 'features': features},
+                         separators=(',', ':'), ensure_ascii=False)
+    return payload.replace('</', '<\\/')
+
+
+def popup_html(row):
+    return POPUP_TEMPLATE.format(
+        color=row['map_color'], city=row['city'], zip=row['zip_code'],
+        **{key: f"{row[col]:.1f}" for key, col in POPUP_SCORES.items()})
+
+
+def tooltip_text(row):
+    return f"{row['city']} ({row['zip_code']}): {row['livability_score']:.1f}"
+
+
+def map_mode(n_rows):
+    return 'geojson' if n_rows > GEOJSON_THRESHOLD else 'markers'
+
+
+def build_base_map(df, mode='auto', cluster=False):
+    m = folium.Map(
+        location=[df['latitude'].mean(), df['longitude'].mean()],
+        zoom_start=ZOOM_START,
+        tiles='CartoDB positron'
+    )
+    m.get_root().html.add_child(folium.Element(LEGEND_HTML))
+
+    if mode == 'auto':
+        mode = map_mode(len(df))
+    if mode == 'geojson' or cluster:
+        GeoJsonPoints(df, cluster=cluster).add_to(m)
+        return m
+
+    for _, row in df.iterrows():
+        folium.CircleMarker(
+            location=[row['latitude'], row['longitude']],
+            radius=8,
+            popup=folium.Popup(popup_html(row), max_width=300),
+            tooltip=tooltip_text(row),
+            color=row['map_color'],
+            fill=True,
+            fillColor=row['map_color'],
+            fillOpacity=0.7,
+            weight=2
+        ).add_to(m)
+    return m
+
+
+def render_base_map(df, mode='auto', cluster=False):
+    """Standalone HTML for the base map plus the Leaflet variable name overlays attach to."""
+    m = build_base_map(df, mode, cluster)
+    return m.get_root().render(), m.get_name()
+
+
+def add_selection_overlay(html, map_name, row, zoom=ZOOM_START):
+    overlay = SELECTION_SCRIPT.format(
+        map_name=map_name,
+        lat=float(row['latitude']),
+        lon=float(row['longitude']),
+        zoom=zoom,
+        color=SELECTED_COLOR,
+        popup=json.dumps(popup_html(row)),
+        tooltip=json.dumps(tooltip_text(row)),
+    )
+    end = html.rindex('</html>')
+    return html[:end] + overlay + html[end:]
@@ -0,0 +1,96 @@
+"""
+Warm-up job - scores, rank tables, sort orders, labels, radar baselines and base
+maps for every region, in parallel. Regions are spread over a ProcessPoolExecutor
+and every worker writes to the disk tier of the artifact cache the dashboard reads,
+so nobody waits on a region's first scoring. The disk tier's byte budget
+(LIVABILITY_ARTIFACT_DISK_MB) applies here too, so size it to hold every region
+
+Usage: python precompute.py [--workers 8] [--normalization region global]
+                            [--cluster] [--weights crime_score=0.3 ...]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from artifacts import (ARTIFACT_DIR, ArtifactCache, DiskTier, base_map, radar_baseline,
+                       rank_table, score_version, scored_frame, sort_order, sub_scores)
+from datastore import load_dataset
+from regions import NORMALIZATION_MODES, discover_regions, region_bounds
+from score_batch import parse_weights
+from scoring import combine_bounds, data_fingerprint
+
+
+def precompute_region(region, bounds, weights, cluster_options, artifact_dir=ARTIFACT_DIR):
+    """Fill the disk cache for one region; returns (region id, rows, seconds)."""
+    start = time.perf_counter()
+    cache = ArtifactCache([DiskTier(artifact_dir)])
+    # Loading also builds the region's Feather snapshot if it is missing or stale
+    df = load_dataset(region['path'])
+    version = score_version(data_fingerprint(df), bounds)
+    sub = sub_scores(df, version, bounds, cache)
+    scored = scored_frame(sub, version, weights, cache)
+    radar_baseline(sub, version, cache)
+    for largest in [True, False]:
+        rank_table(scored, version, weights, largest=largest, cache=cache)
+    sort_order(scored, version, weights, cache=cache)
+    for cluster in cluster_options:
+        base_map(scored, version, weights, cluster, cache)
+    return region['id'], len(df), time.perf_counter() - start
+
+
+def precompute(regions, weights, modes=('region',), cluster_options=(False,),
+               workers=None, artifact_dir=ARTIFACT_DIR):
+    """Yield (mode, region id, rows, seconds) as each region finishes."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        bounds = {'region': None}
+        if 'global' in modes:
+            # Same bounds the dashboard derives for "All regions", scanned in parallel
+            bounds['global'] = combine_bounds(list(pool.map(
+                region_bounds, [region['path'] for region in regions.values()])))
+
+        jobs = {pool.submit(precompute_region, region, bounds[mode], weights,
+                            cluster_options, artifact_dir): mode
+                for mode in modes for region in regions.values()}
+        for job in as_completed(jobs):
+            yield (jobs[job], *job.result())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--normalization', nargs='+', choices=list(NORMALIZATION_MODES),
+                        default=['region'])
+    parser.add_argument('--cluster', action='store_true',
+                        help="also build the clustered base map")
+    parser.add_argument('--weights', nargs='*', default=[], metavar='COLUMN=WEIGHT')
+    parser.add_argument('--artifact-dir', default=ARTIFACT_DIR)
+    args = parser.parse_args(argv)
+
+    try:
+        weights = parse_weights(args.weights)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    regions = discover_regions()
+    if not regions:
+        parser.error("No region data found")
+    # A single region is always normalized on its own, as in the dashboard
+    modes = args.normalization if len(regions) > 1 else ['region']
+    cluster_options = [False, True] if args.cluster else [False]
+
+    start = time.perf_counter()
+    n_done = n_rows = 0
+    for mode, region_id, rows, seconds in precompute(regions, weights, modes, cluster_options,
+                                                     args.workers, args.artifact_dir):
+        n_done += 1
+        n_rows += rows
+        print(f"  {region_id:<24} {mode:<7} {rows:>8} rows {seconds:>7.2f} s")
+    elapsed = time.perf_counter() - start
+    print(f"{n_done} region builds ({n_rows} rows) in {elapsed:.2f} s with {args.workers} workers "
+          f"- {n_done / elapsed:.2f} regions/s")
+
+
+if __name__ == '__main__':
+    main()
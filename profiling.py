@@ -0,0 +1,130 @@
+"""
+Rerun profiler - named wall-clock and memory sections for one script run
+Off by default and close to free when off; turned on per browser tab with the
+?profile=1 query parameter (?profile=memory also traces allocations) or for the
+whole server with LIVABILITY_PROFILE. LIVABILITY_PROFILE_LOG names a JSON-lines
+file that receives one record per profiled rerun for offline analysis
+
+Allocation tracing is process-wide and slows every thread, so it runs only while
+some memory-profiled rerun is in progress and stops when the last one finishes
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+
+PROFILE_ENV = 'LIVABILITY_PROFILE'
+PROFILE_LOG_ENV = 'LIVABILITY_PROFILE_LOG'
+PROFILE_MODES = {'1': 'time', 'true': 'time', 'time': 'time', 'memory': 'memory'}
+
+# Memory-profiled reruns in progress, and whether tracing was started for them
+# (rather than already on, e.g. via PYTHONTRACEMALLOC, in which case it is left on)
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+def profile_mode(query_value=None, environ=os.environ):
+    """'time', 'memory' or None, from the query parameter or else the environment."""
+    value = query_value if query_value is not None else environ.get(PROFILE_ENV)
+    return PROFILE_MODES.get(str(value).lower()) if value is not None else None
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, IndexError):
+        # Not Linux; the panel just leaves the column out
+        return None
+
+
+class Profiler:
+    def __init__(self, mode=None):
+        self.mode = mode
+        self.enabled = mode is not None
+        self._release = None
+        self.restart()
+
+    def restart(self):
+        """Start a new run on the same profiler, e.g. for a fragment rerun after the full run."""
+        self.stop()
+        self.finished = False
+        self.sections = []
+        self.depth = 0
+        self.started = time.perf_counter()
+        self.started_rss = current_rss_mb() if self.enabled else None
+        # Allocation tracing slows every thread in the process, so it is opt-in and
+        # released by stop(), or when the profiler is collected if a run never gets there
+        if self.mode == 'memory':
+            _acquire_tracing()
+            self._release = weakref.finalize(self, _release_tracing)
+
+    def stop(self):
+        """End this run and its allocation tracing; safe to call more than once."""
+        self.finished = True
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+    @contextlib.contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        record = {'name': name, 'depth': self.depth}
+        self.sections.append(record)
+        self.depth += 1
+        # Other sessions' tracing is not this run's to report
+        tracing = self.mode == 'memory' and tracemalloc.is_tracing()
+        traced = tracemalloc.get_traced_memory()[0] if tracing else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['ms'] = (time.perf_counter() - start) * 1000
+            if traced is not None:
+                record['alloc_kb'] = (tracemalloc.get_traced_memory()[0] - traced) / 1024
+            self.depth -= 1
+
+    def report(self, **context):
+        """The run so far - total, per-section timings and process memory - plus context fields."""
+        total_ms = (time.perf_counter() - self.started) * 1000
+        top_level_ms = sum(s['ms'] for s in self.sections if s['depth'] == 0 and 'ms' in s)
+        rss = current_rss_mb()
+        return {
+            'timestamp': time.time(),
+            **context,
+            'total_ms': total_ms,
+            'unprofiled_ms': total_ms - top_level_ms,
+            'rss_mb': rss,
+            'rss_delta_mb': None if rss is None or self.started_rss is None else rss - self.started_rss,
+            'sections': [s for s in self.sections if 'ms' in s],
+        }
+
+
+def append_jsonl(path, record):
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
@@ -0,0 +1,162 @@
+"""
+Zip query engine - range filters on any metric or score, and "zips like this"
+Range predicates are answered from per-column sorted indexes: the most selective
+predicate is a binary-searched slice of its index and the rest are checked on that
+slice only. Similarity is k-nearest neighbours in the 0-100 sub-score space, from a
+KD-tree over the five scores
+
+Latency targets at 100k zips: a few milliseconds per filter or similarity query
+once the indexes exist (each sorted index is built on first use of its column)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from leaderboard import SORT_COLUMNS
+from scoring import SCORE_COLUMNS, top_k
+
+# Filterable column -> label, metrics first, then scores
+FILTER_COLUMNS = {
+    'median_income': 'Median income ($)',
+    'median_home_value': 'Median home value ($)',
+    'mean_commute_time': 'Commute time (min)',
+    'crime_rate': 'Crime rate (per 1,000)',
+    'population': 'Population',
+    'unemployment_rate': 'Unemployment (%)',
+    'pct_bachelors_plus': "Bachelor's degree+ (%)",
+    'housing_burden': 'Housing burden (%)',
+    'livability_score': 'Overall score',
+    'crime_score': 'Safety score',
+    'education_score': 'Education score',
+    'jobs_score': 'Jobs score',
+    'housing_score': 'Housing score',
+    'transportation_score': 'Transportation score',
+}
+
+# Below this many candidate rows a filtered similarity query scans them directly
+SCAN_CANDIDATES = 4096
+
+
+class QueryEngine:
+    """Range queries over one scored frame; sorted indexes are built per column on first use."""
+
+    def __init__(self, df):
+        self.df = df
+        self.n_rows = len(df)
+        # Shared across sessions: concurrent first uses may both build an index, harmlessly
+        self.indexes = {}
+
+    def index(self, col):
+        """(row order, sorted values) of one column."""
+        if col not in self.indexes:
+            values = self.df[col].to_numpy()
+            order = np.argsort(values, kind='stable')
+            self.indexes[col] = (order, values[order])
+        return self.indexes[col]
+
+    def bounds(self, col):
+        """(min, max) of the column, missing values skipped; None if every value is missing."""
+        _, ordered = self.index(col)
+        if ordered.dtype.kind == 'f':
+            # NaN sorts last
+            ordered = ordered[:len(ordered) - np.count_nonzero(np.isnan(ordered))]
+        if len(ordered) == 0:
+            return None
+        return ordered[0].item(), ordered[-1].item()
+
+    def range_slice(self, col, lo=None, hi=None):
+        """Slice of the column's index holding lo <= value <= hi (either end open)."""
+        _, ordered = self.index(col)
+        start = 0 if lo is None else np.searchsorted(ordered, lo, side='left')
+        stop = len(ordered) if hi is None else np.searchsorted(ordered, hi, side='right')
+        return slice(start, max(start, stop))
+
+    def filter(self, ranges):
+        """Row positions, in row order, matching every (lo, hi) range in ranges {column: (lo, hi)}."""
+        if not ranges:
+            return np.arange(self.n_rows)
+        slices = {col: self.range_slice(col, lo, hi) for col, (lo, hi) in ranges.items()}
+        # Start from the narrowest predicate and test the others on its rows only
+        first = min(slices, key=lambda col: slices[col].stop - slices[col].start)
+        positions = self.index(first)[0][slices[first]]
+        for col, (lo, hi) in ranges.items():
+            if col == first or len(positions) == 0:
+                continue
+            values = self.df[col].to_numpy()[positions]
+            keep = np.ones(len(positions), dtype=bool)
+            if lo is not None:
+                keep &= values >= lo
+            if hi is not None:
+                keep &= values <= hi
+            positions = positions[keep]
+        return np.sort(positions)
+
+    def best(self, positions, limit, score_col='livability_score'):
+        """The best-scoring limit of positions, best first."""
+        values = self.df[score_col].to_numpy()[positions]
+        return positions[top_k(values, limit)]
+
+
+class SimilarityIndex:
+    """Nearest zips by Euclidean distance between sub-score vectors.
+
+    Zips with a missing sub-score have no position in score space: they are left
+    out of the tree and never returned.
+    """
+
+    def __init__(self, df, columns=SCORE_COLUMNS):
+        self.points = df[columns].to_numpy(dtype=np.float64)
+        self.finite = np.isfinite(self.points).all(axis=1)
+        # Tree position -> row position
+        self.rows = np.flatnonzero(self.finite)
+        self.tree = cKDTree(self.points[self.rows])
+
+    def has_scores(self, pos):
+        return bool(self.finite[pos])
+
+    def _query(self, pos, n_probe):
+        dist, idx = self.tree.query(self.points[pos], n_probe)
+        return self.rows[np.atleast_1d(idx)], np.atleast_1d(dist)
+
+    def similar(self, pos, k, candidates=None):
+        """Positions and distances of the k zips most like row pos, closest first.
+
+        The zip itself is left out; candidates (sorted row positions) restricts the
+        answer, e.g. to the rows of a range filter. Empty if row pos has a missing score.
+        """
+        n = len(self.rows)
+        if not self.finite[pos] or n == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        if candidates is None:
+            idx, dist = self._query(pos, min(n, k + 1))
+            keep = idx != pos
+            return idx[keep][:k], dist[keep][:k]
+
+        if len(candidates) > SCAN_CANDIDATES:
+            # A broad filter usually keeps enough of the unfiltered neighbours: probe
+            # the tree for twice as many as the filter's pass rate suggests
+            n_probe = min(n, 2 * (k + 1) * n // len(candidates))
+            idx, dist = self._query(pos, n_probe)
+            keep = (idx != pos) & np.isin(idx, candidates, assume_unique=True)
+            if keep.sum() >= k or n_probe == n:
+                return idx[keep][:k], dist[keep][:k]
+
+        # Narrow filters, or ones that exclude the neighbourhood: scan the candidates
+        candidates = candidates[self.finite[candidates] & (candidates != pos)]
+        dist = np.linalg.norm(self.points[candidates] - self.points[pos], axis=1)
+        best = top_k(dist, k, largest=False)
+        return candidates[best], dist[best]
+
+
+def result_table(df, positions, columns=(), distances=None):
+    """Zip/City/score table for the given rows, plus the filtered metric columns and distances."""
+    rows = df.iloc[positions]
+    table = {'Zip': rows['zip_code'].to_numpy(), 'City': rows['city'].to_numpy()}
+    table.update({header: rows[col].to_numpy(dtype=np.float64).round(1)
+                  for col, header in SORT_COLUMNS.items()})
+    table.update({FILTER_COLUMNS[col]: rows[col].to_numpy()
+                  for col in columns if col not in SORT_COLUMNS})
+    if distances is not None:
+        table['Distance'] = np.round(distances, 1)
+    return pd.DataFrame(table)
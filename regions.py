@@ -0,0 +1,76 @@
+"""
+Region registry - one data file per county/state, discovered on disk and loaded lazily
+Regions live in REGION_DIR as <region id>.csv or .parquet, with display labels in an
+optional regions.json manifest ({"middlesex-ma": "Middlesex County, MA", ...});
+the bundled Middlesex file is always available as the default region
+"""
+
+import json
+import os
+
+import numpy as np
+
+from datastore import DATA_FILE, iter_chunks
+from scoring import METRIC_COLUMNS, combine_bounds, metric_bounds
+
+REGION_DIR = 'regions'
+MANIFEST_FILE = 'regions.json'
+REGION_FORMATS = ('.csv', '.parquet')
+
+DEFAULT_REGION = {'id': 'middlesex-ma', 'label': 'Middlesex County, MA', 'path': DATA_FILE}
+
+# 'region' scales each metric over the selected region only, 'global' over every region
+NORMALIZATION_MODES = {'region': "This region", 'global': "All regions"}
+
+SCAN_CHUNK_SIZE = 100_000
+
+
+def _read_manifest(region_dir):
+    try:
+        with open(os.path.join(region_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def region_label(region_id):
+    return region_id.replace('-', ' ').replace('_', ' ').title()
+
+
+def discover_regions(region_dir=REGION_DIR, default=DEFAULT_REGION):
+    """Region id -> {'id', 'label', 'path'}, default first, then by label."""
+    regions = {}
+    if os.path.exists(default['path']):
+        regions[default['id']] = default
+
+    if os.path.isdir(region_dir):
+        labels = _read_manifest(region_dir)
+        found = []
+        for name in os.listdir(region_dir):
+            region_id, ext = os.path.splitext(name)
+            if ext in REGION_FORMATS and region_id not in regions:
+                found.append({'id': region_id,
+                              'label': labels.get(region_id, region_label(region_id)),
+                              'path': os.path.join(region_dir, name)})
+        regions.update((r['id'], r) for r in sorted(found, key=lambda r: r['label']))
+    return regions
+
+
+def regions_version(regions):
+    """Cheap change marker for the region files - paths, sizes and modification times."""
+    version = []
+    for region in regions.values():
+        stat = os.stat(region['path'])
+        version.append((region['path'], stat.st_size, stat.st_mtime_ns))
+    return tuple(version)
+
+
+def region_bounds(path, chunksize=SCAN_CHUNK_SIZE):
+    """Metric bounds of one region file, reading only the metric columns."""
+    return combine_bounds([metric_bounds(chunk[METRIC_COLUMNS].to_numpy(dtype=np.float64))
+                           for chunk in iter_chunks(path, chunksize, columns=METRIC_COLUMNS)])
+
+
+def global_bounds(regions):
+    """Metric bounds across every region, for globally comparable scores."""
+    return combine_bounds([region_bounds(region['path']) for region in regions.values()])
@@ -0,0 +1,120 @@
+"""
+Headless batch scoring - scores, ranks and labels for zip code files, no Streamlit
+Each input is read twice in chunks: the first pass keeps only the metric columns
+the min-max bounds and rank references need, the second scores every chunk against
+them and streams it to the output, so memory stays at a few columns per row
+
+Usage: python score_batch.py regions/*.csv -o scored/ [--format parquet|geojson]
+                             [--weights crime_score=0.3 jobs_score=0.3 ...]
+"""
+
+import argparse
+import math
+import os
+
+import numpy as np
+
+from datastore import iter_chunks
+from export import EXPORT_FORMATS, export_columns, plain_strings, write_export
+from interpretation import add_label_columns
+from scoring import (DEFAULT_WEIGHTS, METRIC_COLUMNS, RANKED_METRICS, SCORE_COLUMNS,
+                     calculate_scores, metric_bounds, rank_references)
+
+CHUNK_SIZE = 100_000
+FORMATS = list(EXPORT_FORMATS)
+LABELED = RANKED_METRICS + SCORE_COLUMNS + ['livability_score']
+
+
+def scan_metrics(path, chunksize=CHUNK_SIZE):
+    """First pass - the metric and ranked columns over the whole file."""
+    needed = list(dict.fromkeys(METRIC_COLUMNS + RANKED_METRICS))
+    parts = {col: [] for col in needed}
+    for chunk in iter_chunks(path, chunksize):
+        for col in needed:
+            parts[col].append(chunk[col].to_numpy())
+    return {col: np.concatenate(values) for col, values in parts.items()}
+
+
+def score_chunks(path, weights=DEFAULT_WEIGHTS, chunksize=CHUNK_SIZE):
+    """Scored, ranked and labeled chunks, identical to scoring the whole file at once.
+
+    Display-only columns (colors, emojis, map styling) are left out, as in every export.
+    """
+    columns = scan_metrics(path, chunksize)
+    bounds = metric_bounds(np.column_stack([columns[col].astype(np.float64)
+                                            for col in METRIC_COLUMNS]))
+    references = rank_references(columns, weights, bounds)
+    del columns
+
+    for chunk in iter_chunks(path, chunksize):
+        scored = add_label_columns(calculate_scores(chunk, weights, bounds, references), LABELED)
+        yield plain_strings(scored[export_columns(scored)])
+
+
+def output_path_for(input_path, output_dir, fmt):
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f'{name}_scored.{fmt}')
+
+
+def score_file(input_path, output_path, weights=DEFAULT_WEIGHTS, chunksize=CHUNK_SIZE, fmt=None):
+    """Score one CSV/Parquet file into output_path; the format follows its extension by default."""
+    fmt = fmt or os.path.splitext(output_path)[1].lstrip('.')
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported output format: {fmt!r} (expected one of {FORMATS})")
+    # Written next to the target and swapped in, so a failed run never leaves half a file
+    return write_export(score_chunks(input_path, weights, chunksize), output_path, fmt)
+
+
+def parse_weights(pairs):
+    """Weights from score_column=value pairs, filled in from the defaults and scaled to sum to 1."""
+    if not pairs:
+        # Exactly the dashboard's defaults, so precomputed artifacts match its cache keys
+        return dict(DEFAULT_WEIGHTS)
+    weights = dict(DEFAULT_WEIGHTS)
+    for pair in pairs:
+        col, sep, value = pair.partition('=')
+        if not sep or col not in weights:
+            raise argparse.ArgumentTypeError(
+                f"Bad weight {pair!r}: expected one of {SCORE_COLUMNS} as column=value")
+        try:
+            weights[col] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Bad weight {pair!r}: {value!r} is not a number") from None
+        if not math.isfinite(weights[col]) or weights[col] < 0:
+            raise argparse.ArgumentTypeError(f"Bad weight {pair!r}: weights must be finite and 0 or more")
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("Weights must not all be zero")
+    return {col: value / total for col, value in weights.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help="CSV or Parquet files to score")
+    parser.add_argument('-o', '--output-dir', default='.', help="where the *_scored files go")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--weights', nargs='*', default=[], metavar='COLUMN=WEIGHT')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        weights = parse_weights(args.weights)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    outputs = {}
+    for input_path in args.inputs:
+        output_path = output_path_for(input_path, args.output_dir, args.format)
+        if output_path in outputs:
+            parser.error(f"{outputs[output_path]} and {input_path} would both be written to "
+                         f"{output_path}; score them into different output directories")
+        outputs[output_path] = input_path
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for output_path, input_path in outputs.items():
+        score_file(input_path, output_path, weights, args.chunksize, args.format)
+        print(f"{input_path} -> {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Livability scoring engine - vectorized sub-scores and weighted composite
+Streamlit-free so it can be imported by the dashboard, scripts and benchmarks
+"""
+
+import hashlib
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Score dimensions: (score column, source metric column, higher metric is better)
+SCORE_DIMENSIONS = [
+    ('crime_score', 'crime_rate', False),
+    ('education_score', 'education_index', True),
+    ('jobs_score', 'unemployment_rate', False),
+    ('housing_score', 'housing_burden', False),
+    ('transportation_score', 'transportation_index', False),
+]
+
+SCORE_COLUMNS = [score for score, _, _ in SCORE_DIMENSIONS]
+METRIC_COLUMNS = [metric for _, metric, _ in SCORE_DIMENSIONS]
+HIGHER_IS_BETTER = np.array([higher for _, _, higher in SCORE_DIMENSIONS])
+
+# Raw metrics that get precomputed rank/percentile columns alongside the scores
+RANKED_METRICS = ['crime_rate', 'pct_bachelors_plus', 'unemployment_rate',
+                  'housing_burden', 'mean_commute_time', 'median_income']
+
+DEFAULT_WEIGHTS = {'crime_score': 0.25, 'education_score': 0.25, 'jobs_score': 0.20,
+                   'housing_score': 0.20, 'transportation_score': 0.10}
+
+# Stored dtypes of the derived columns. Scores are computed in float64 and kept
+# as float32 (0-100 shown to one decimal); percentiles are 0-100
+SCORE_DTYPE = np.float32
+RANK_DTYPE = np.int32
+PCTILE_DTYPE = np.int8
+
+# Sub-score of a metric that does not vary across the zips being scored
+NEUTRAL_SCORE = 50.0
+
+
+def data_fingerprint(df):
+    """Stable content hash of a frame, used as the cache key for derived data."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+def weight_vector(weights):
+    return np.array([weights[col] for col in SCORE_COLUMNS], dtype=np.float64)
+
+
+def metrics_matrix(df):
+    return df[METRIC_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def composite_score(scores, weights):
+    """Weighted sum of the sub-score columns.
+
+    Accumulated column by column rather than with a matrix product, whose
+    rounding depends on memory layout, so chunked results match whole-file ones.
+    """
+    w = weight_vector(weights)
+    return sum(scores[:, i] * w[i] for i in range(len(w)))
+
+
+def metric_bounds(metrics):
+    """Per-metric (min, max - min) used by the min-max scaling; missing values are skipped."""
+    with warnings.catch_warnings():
+        # An all-missing column has no bounds; its scores stay missing
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lo = np.nanmin(metrics, axis=0)
+        return lo, np.nanmax(metrics, axis=0) - lo
+
+
+def combine_bounds(bounds):
+    """Bounds spanning several metric_bounds results, e.g. every region of a deployment."""
+    lo = np.min([b[0] for b in bounds], axis=0)
+    hi = np.max([b[0] + b[1] for b in bounds], axis=0)
+    return lo, hi - lo
+
+
+def normalize_metrics(metrics, bounds=None):
+    """Min-max scale every metric column to 0-100 in one pass, inverting lower-is-better ones.
+
+    bounds fixes the scaling to precomputed metric_bounds, e.g. over a whole file read in chunks.
+    A metric with the same value everywhere (as in any single-zip region) cannot tell
+    zips apart, so every zip gets the midpoint, NEUTRAL_SCORE, for it.
+    """
+    lo, span = metric_bounds(metrics) if bounds is None else bounds
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = (metrics - lo) / span * 100
+    scaled = np.where(HIGHER_IS_BETTER, scaled, 100 - scaled)
+    return np.where(span == 0, np.where(np.isnan(metrics), np.nan, NEUTRAL_SCORE), scaled)
+
+
+def rank_and_percentile(values, ordered=None):
+    """Rank (1 = highest) and percentile for every value from one sort of the column.
+
+    Matches the per-value scans they replace: rank counts strictly greater values
+    plus one, percentile is the truncated share of strictly smaller values.
+    ordered is the sorted column to rank against when values are only part of it.
+    A missing value compares neither greater nor smaller than anything, as in the
+    scans: it ranks first with percentile 0 and does not move the others.
+    """
+    values = np.asarray(values)
+    ordered = np.sort(values) if ordered is None else ordered
+    n = len(ordered)
+    # NaN sorts last; rank against the values in front of it only
+    valid = ordered[:n - np.count_nonzero(np.isnan(ordered))] if ordered.dtype.kind == 'f' else ordered
+    n_less = np.searchsorted(valid, values, side='left')
+    n_greater = len(valid) - np.searchsorted(valid, values, side='right')
+    if values.dtype.kind == 'f':
+        n_less[np.isnan(values)] = 0
+    return (n_greater + 1).astype(RANK_DTYPE), (n_less / n * 100).astype(PCTILE_DTYPE)
+
+
+def add_rank_columns(df, columns, references=None):
+    ranks = {}
+    for col in columns:
+        ordered = None if references is None else references[col]
+        ranks[f'{col}_rank'], ranks[f'{col}_pctile'] = rank_and_percentile(df[col].to_numpy(), ordered)
+    return df.assign(**ranks)
+
+
+def sub_score_matrix(metrics, bounds=None):
+    """Stored sub-scores, one contiguous column per score."""
+    return normalize_metrics(metrics, bounds).astype(SCORE_DTYPE, order='F')
+
+
+def calculate_sub_scores(df, bounds=None, references=None):
+    # assign shares the input's columns instead of copying the whole frame
+    scores = sub_score_matrix(metrics_matrix(df), bounds)
+    df = df.assign(**{col: scores[:, i] for i, col in enumerate(SCORE_COLUMNS)})
+    return add_rank_columns(df, RANKED_METRICS + SCORE_COLUMNS, references)
+
+
+def livability_scores(scores, weights):
+    return composite_score(scores, weights).astype(SCORE_DTYPE)
+
+
+def apply_weights(df, weights, references=None):
+    """Composite score for an already sub-scored frame - only the weighted dot product."""
+    df = df.assign(livability_score=livability_scores(df[SCORE_COLUMNS].to_numpy(), weights))
+    return add_rank_columns(df, ['livability_score'], references)
+
+
+def calculate_scores(df, weights=DEFAULT_WEIGHTS, bounds=None, references=None):
+    """Scores, ranks and percentiles; bounds/references score a chunk against a whole file."""
+    return apply_weights(calculate_sub_scores(df, bounds, references), weights, references)
+
+
+def rank_references(columns, weights=DEFAULT_WEIGHTS, bounds=None):
+    """Sorted reference column for every ranked column, from the raw metric columns alone.
+
+    columns maps each of METRIC_COLUMNS and RANKED_METRICS to its values over the
+    whole dataset; the result is what add_rank_columns ranks chunks against.
+    """
+    metrics = np.column_stack([np.asarray(columns[col], dtype=np.float64)
+                               for col in METRIC_COLUMNS])
+    scores = sub_score_matrix(metrics, bounds)
+    references = {col: np.sort(np.asarray(columns[col])) for col in RANKED_METRICS}
+    references.update({col: np.sort(scores[:, i]) for i, col in enumerate(SCORE_COLUMNS)})
+    references['livability_score'] = np.sort(livability_scores(scores, weights))
+    return references
+
+
+def top_k(values, k, largest=True):
+    """Positions of the k largest (or smallest) values, best first, via a partial sort.
+
+    Ties keep their original order, matching DataFrame.nlargest/nsmallest. Missing
+    values come last either way, so a non-empty input always yields a position.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    # NaN fails every <= test below; key it as the worst value instead
+    keyed = np.where(np.isnan(values), np.inf, -values if largest else values)
+    k = min(k, len(keyed))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    kth = np.partition(keyed, k - 1)[k - 1]
+    candidates = np.flatnonzero(keyed <= kth)
+    order = np.lexsort((candidates, keyed[candidates]))
+    return candidates[order[:k]]
@@ -0,0 +1,163 @@
+"""
+Zip pickers - option lists and search over "zip - city" labels
+ZipSearchIndex is built once per dataset: a sorted zip array for prefix lookups,
+sorted word-start suffixes of each city name for prefix lookups and a trigram
+index for substring/typo matches when nothing matches by prefix. ZipOptions adds
+the score order per weight set, so a query or city filter becomes a row mask or
+array slice, best score first
+
+Latency targets at 100k zips: index build under 1 s (once per dataset) and
+under 10 ms per query, so a search keystroke stays well within a fragment rerun
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+ALL_CITIES = 'All Cities'
+LABEL_SEPARATOR = ' - '
+
+# The pickers never send more options than this to the browser
+MAX_OPTIONS = 200
+
+# Share of a query's trigrams a city name must contain to count as a fuzzy match
+TRIGRAM_MATCH = 0.6
+
+
+def zip_labels(df):
+    return (df['zip_code'].astype(str) + LABEL_SEPARATOR + df['city'].astype(str)).to_numpy()
+
+
+def label_zip(label):
+    return label.split(LABEL_SEPARATOR)[0]
+
+
+def normalize(text):
+    return ' '.join(text.lower().split())
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def prefix_range(ordered, prefix):
+    """Slice bounds of the entries starting with prefix in a sorted string array."""
+    return (np.searchsorted(ordered, prefix, side='left'),
+            np.searchsorted(ordered, prefix + '\uffff', side='left'))
+
+
+class ZipSearchIndex:
+    def __init__(self, df):
+        self.labels = zip_labels(df)
+        self.cities, self.row_city = np.unique(df['city'].astype(str).to_numpy(),
+                                               return_inverse=True)
+
+        zips = df['zip_code'].astype(str).to_numpy()
+        self.zip_order = np.argsort(zips, kind='stable')
+        self.sorted_zips = zips[self.zip_order]
+
+        # "north reading" is found by "north", "north rea" and "read"
+        suffixes, owners = [], []
+        grams = defaultdict(list)
+        for city_id, name in enumerate(map(normalize, self.cities.tolist())):
+            words = name.split(' ')
+            for start in range(len(words)):
+                suffixes.append(' '.join(words[start:]))
+                owners.append(city_id)
+            for gram in trigrams(name):
+                grams[gram].append(city_id)
+        suffixes = np.array(suffixes, dtype=object)
+        order = np.argsort(suffixes, kind='stable')
+        self.city_suffixes = suffixes[order]
+        self.suffix_city = np.array(owners, dtype=np.intp)[order]
+        self.city_trigrams = {gram: np.array(ids, dtype=np.intp) for gram, ids in grams.items()}
+
+    def prefix_cities(self, query):
+        """Boolean mask over cities with a word starting with the query."""
+        mask = np.zeros(len(self.cities), dtype=bool)
+        lo, hi = prefix_range(self.city_suffixes, query)
+        mask[self.suffix_city[lo:hi]] = True
+        return mask
+
+    def fuzzy_cities(self, query):
+        """Boolean mask over cities sharing most of the query's trigrams."""
+        mask = np.zeros(len(self.cities), dtype=bool)
+        grams = trigrams(query)
+        hits = [self.city_trigrams[gram] for gram in grams if gram in self.city_trigrams]
+        if hits:
+            counts = np.bincount(np.concatenate(hits), minlength=len(self.cities))
+            mask |= counts >= TRIGRAM_MATCH * len(grams)
+        return mask
+
+    def match(self, query):
+        """Row mask of zips whose code or city starts with the query, else whose city resembles it."""
+        query = normalize(label_zip(query))
+        mask = self.prefix_cities(query)[self.row_city]
+        lo, hi = prefix_range(self.sorted_zips, query)
+        mask[self.zip_order[lo:hi]] = True
+        if not mask.any():
+            mask = self.fuzzy_cities(query)[self.row_city]
+        return mask
+
+
+class ZipOptions:
+    def __init__(self, df, index, score_col='livability_score'):
+        self.index = index
+        self.labels = index.labels
+        self.cities = index.cities
+        self.row_city = index.row_city
+        self.city_ids = {city: i for i, city in enumerate(self.cities.tolist())}
+
+        # Best score first; ties keep row order like a stable sort_values
+        self.by_score = np.argsort(-df[score_col].to_numpy(), kind='stable')
+        self.ranked = self.labels[self.by_score]
+
+        # Regroup the score order by city, then record where each city starts
+        by_city = self.by_score[np.argsort(self.row_city[self.by_score], kind='stable')]
+        self.grouped = self.labels[by_city]
+        self.city_bounds = np.searchsorted(self.row_city[by_city], np.arange(len(self.cities) + 1))
+
+    def for_city(self, city):
+        """Labels for one city (or every zip), best score first."""
+        if city == ALL_CITIES:
+            return self.ranked
+        i = self.city_ids[city]
+        return self.grouped[self.city_bounds[i]:self.city_bounds[i + 1]]
+
+    def search(self, query):
+        """Row mask of the zips matching a search box query, or None when it is blank."""
+        return self.index.match(query) if query.strip() else None
+
+    def city_options(self, matches=None, current=None, limit=MAX_OPTIONS):
+        """'All Cities' plus the first cities with matching zips, alphabetically, and how many matched."""
+        cities = self.cities
+        if matches is not None:
+            cities = cities[np.bincount(self.row_city[matches], minlength=len(cities)) > 0]
+        options = [ALL_CITIES] + cities[:limit].tolist()
+        if current is not None and current not in options and current in self.city_ids:
+            options.append(current)
+        return options, len(cities)
+
+    def zip_options(self, matches=None, city=ALL_CITIES, limit=MAX_OPTIONS):
+        """The best-scoring matching labels in the city, and how many zips matched in all."""
+        if matches is None:
+            options = self.for_city(city)
+            return options[:limit], len(options)
+        if city != ALL_CITIES:
+            matches = matches & (self.row_city == self.city_ids[city])
+        ranked = self.by_score[matches[self.by_score]]
+        return self.labels[ranked[:limit]], len(ranked)
+
+    def comparison_options(self, matches=None, exclude_pos=None, chosen=(), limit=MAX_OPTIONS):
+        """The chosen labels plus the best-scoring matching ones, and how many zips matched in all.
+
+        The zip at row exclude_pos (the one being compared against) is never offered.
+        """
+        ranked = self.by_score if matches is None else self.by_score[matches[self.by_score]]
+        if exclude_pos is not None:
+            ranked = ranked[ranked != exclude_pos]
+        chosen = list(chosen)
+        kept = set(chosen)
+        offered = [label for label in self.labels[ranked[:limit + len(chosen)]].tolist()
+                   if label not in kept]
+        return chosen + offered[:limit], len(ranked)
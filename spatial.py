@@ -0,0 +1,54 @@
+"""
+Spatial index over zip code centroids - k-nearest and within-radius queries
+Points are stored as 3D unit vectors, so straight-line (chord) distance in the
+KD-tree orders neighbours exactly like great-circle distance
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def to_unit_vectors(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    return np.column_stack([np.cos(lat) * np.cos(lon),
+                            np.cos(lat) * np.sin(lon),
+                            np.sin(lat)])
+
+
+def chord_to_miles(chord):
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(chord, 2) / 2)
+
+
+def miles_to_chord(miles):
+    return 2 * np.sin(np.minimum(miles / EARTH_RADIUS_MILES, np.pi) / 2)
+
+
+class SpatialIndex:
+    def __init__(self, lat, lon):
+        self.points = to_unit_vectors(lat, lon)
+        self.tree = cKDTree(self.points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, pos, k, radius_miles=None):
+        """Row positions and distances (miles) of the k zips closest to row pos, excluding itself."""
+        # The tree's upper bound is exclusive; nudge it so the radius is inclusive like within()
+        upper = np.inf if radius_miles is None else np.nextafter(miles_to_chord(radius_miles), np.inf)
+        chords, positions = self.tree.query(self.points[pos], k=min(k + 1, len(self)),
+                                            distance_upper_bound=upper)
+        chords, positions = np.atleast_1d(chords), np.atleast_1d(positions)
+        keep = (positions != pos) & np.isfinite(chords)
+        return positions[keep][:k], chord_to_miles(chords[keep][:k])
+
+    def within(self, pos, radius_miles):
+        """Row positions and distances (miles) of every zip within the radius of row pos, nearest first."""
+        positions = np.asarray(self.tree.query_ball_point(self.points[pos],
+                                                          miles_to_chord(radius_miles)), dtype=np.intp)
+        positions = positions[positions != pos]
+        miles = chord_to_miles(np.linalg.norm(self.points[positions] - self.points[pos], axis=1))
+        order = np.argsort(miles, kind='stable')
+        return positions[order], miles[order]
@@ -0,0 +1,38 @@
+import os
+import time
+
+import numpy as np
+
+from artifacts import ArtifactCache, DiskTier, MemoryTier
+
+
+def test_memory_tier_is_bounded_in_bytes():
+    tier = MemoryTier(max_entries=100, max_bytes=3000)
+    for i in range(10):
+        tier.put('array', i, np.zeros(100))
+    assert list(tier.entries) == [7, 8, 9]
+    assert tier.used == 2400
+
+
+def test_memory_tier_skips_oversized_values():
+    tier = MemoryTier(max_bytes=100)
+    tier.put('array', 'big', np.zeros(100))
+    assert tier.get('array', 'big') is None and tier.used == 0
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    tier = DiskTier(str(tmp_path), max_bytes=5000)
+    cache = ArtifactCache([tier])
+    for i in range(4):
+        tier.put('array', f'k{i}', np.zeros(100))
+        time.sleep(0.01)
+    # A hit counts as a use
+    assert cache.get('array', 'k0') is not None
+    time.sleep(0.01)
+    for i in range(4, 6):
+        tier.put('array', f'k{i}', np.zeros(100))
+        time.sleep(0.01)
+
+    kept = sorted(os.listdir(tmp_path / 'array'))
+    assert 'k0.npy' in kept and 'k1.npy' not in kept
+    assert sum(os.path.getsize(tmp_path / 'array' / name) for name in kept) <= 5000
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from datastore import iter_chunks, load_dataset, read_csv
+
+CSV = """zip_code,city,median_income,median_home_value,population,crime_rate
+1730,Bedford,120000,650000,14000,5.5
+1742,Concord,,900000,,3.1
+"""
+
+
+def write_csv(tmp_path, text=CSV):
+    path = tmp_path / 'zips.csv'
+    path.write_text(text)
+    return str(path)
+
+
+def test_blank_counts_load_as_missing(tmp_path):
+    df = read_csv(write_csv(tmp_path))
+    assert df['zip_code'].tolist() == ['01730', '01742']
+    assert df['median_income'].isna().tolist() == [False, True]
+    # Reaches numpy as float with NaN, so scoring and ranking need no special case
+    values = df['median_income'].to_numpy()
+    assert values.dtype.kind == 'f' and np.isnan(values[1])
+
+
+def test_complete_counts_stay_integers(tmp_path):
+    df = read_csv(write_csv(tmp_path, CSV.replace(',,900000,,', ',98000,900000,17000,')))
+    assert df['population'].to_numpy().dtype == np.int32
+
+
+def test_snapshot_keeps_missing_values(tmp_path):
+    path = write_csv(tmp_path)
+    built = load_dataset(path, str(tmp_path / 'snapshots'))
+    mapped = load_dataset(path, str(tmp_path / 'snapshots'))
+    pd.testing.assert_frame_equal(built, mapped)
+    assert mapped['population'].isna().sum() == 1
+
+
+def test_chunks_keep_missing_values(tmp_path):
+    chunks = list(iter_chunks(write_csv(tmp_path), chunksize=1))
+    assert [chunk['median_income'].isna().item() for chunk in chunks] == [False, True]
+    assert chunks[0]['median_income'].dtype == chunks[1]['median_income'].dtype
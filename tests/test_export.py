@@ -0,0 +1,68 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_dataset
+from export import export_bytes, export_columns, plain_strings
+from interpretation import add_label_columns
+from scoring import RANKED_METRICS, SCORE_COLUMNS, calculate_scores
+
+POSITIONS = np.array([0, 3, 4, 10, 11, 12, 40, 41])
+
+
+@pytest.fixture(scope='module')
+def scored():
+    df = make_dataset(50, seed=2)
+    df.loc[3, 'latitude'] = np.nan
+    df.loc[4, 'crime_rate'] = np.nan
+    return add_label_columns(calculate_scores(df), RANKED_METRICS + SCORE_COLUMNS + ['livability_score'])
+
+
+@pytest.fixture(scope='module')
+def expected(scored):
+    return plain_strings(scored.iloc[POSITIONS][export_columns(scored)]).reset_index(drop=True)
+
+
+def export(scored, fmt):
+    # Small chunks, so rows from several chunks are joined up
+    return export_bytes(scored, POSITIONS, fmt, chunksize=3).getvalue()
+
+
+def test_display_columns_are_left_out(scored, expected):
+    assert 'livability_score_label' in expected
+    assert not [col for col in expected.columns
+                if col.endswith(('_color', '_emoji')) or col.startswith('map_')]
+    assert len(expected.columns) < len(scored.columns)
+
+
+def test_csv_round_trip(scored, expected):
+    df = pd.read_csv(io.BytesIO(export(scored, 'csv')), dtype={'zip_code': str})
+    assert df.columns.tolist() == expected.columns.tolist()
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False, rtol=1e-6)
+
+
+def test_parquet_round_trip(scored, expected):
+    df = pd.read_parquet(io.BytesIO(export(scored, 'parquet')))
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_geojson_round_trip(scored, expected):
+    collection = json.loads(export(scored, 'geojson'))
+    features = collection['features']
+    assert collection['type'] == 'FeatureCollection' and len(features) == len(POSITIONS)
+
+    # The row without a latitude keeps its properties but has no geometry
+    assert features[1]['geometry'] is None
+    coordinates = [f['geometry']['coordinates'] for f in features if f['geometry'] is not None]
+    located = expected.drop(index=1)
+    np.testing.assert_allclose(coordinates, located[['longitude', 'latitude']].to_numpy(), rtol=1e-6)
+
+    properties = pd.DataFrame([f['properties'] for f in features])
+    assert properties.columns.tolist() == [col for col in expected.columns
+                                           if col not in ('latitude', 'longitude')]
+    assert properties['zip_code'].tolist() == expected['zip_code'].tolist()
+    np.testing.assert_allclose(properties['livability_score'], expected['livability_score'], rtol=1e-6)
+    assert properties['crime_rate'].isna().tolist() == expected['crime_rate'].isna().tolist()
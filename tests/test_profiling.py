@@ -0,0 +1,33 @@
+import tracemalloc
+
+from profiling import Profiler
+
+
+def test_memory_tracing_stops_after_the_last_profiled_run():
+    first, second = Profiler('memory'), Profiler('memory')
+    first.stop()
+    assert tracemalloc.is_tracing()
+    second.stop()
+    second.stop()
+    assert not tracemalloc.is_tracing()
+
+
+def test_time_profiles_do_not_report_allocations():
+    memory, timed = Profiler('memory'), Profiler('time')
+    with timed.section('work'):
+        pass
+    memory.stop()
+    assert 'alloc_kb' not in timed.sections[0]
+
+
+def test_restart_begins_a_fresh_run_after_stop():
+    profiler = Profiler('memory')
+    with profiler.section('full run'):
+        pass
+    profiler.stop()
+    assert profiler.finished and not tracemalloc.is_tracing()
+    profiler.restart()
+    assert not profiler.finished and tracemalloc.is_tracing()
+    assert profiler.sections == []
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_dataset
+from query import SCAN_CANDIDATES, QueryEngine, SimilarityIndex
+from scoring import SCORE_COLUMNS, calculate_scores
+
+
+@pytest.fixture(scope='module')
+def scored():
+    # Large enough for a broad filter to take the tree-probe path
+    return calculate_scores(make_dataset(3 * SCAN_CANDIDATES, seed=5))
+
+
+def brute_filter(df, ranges):
+    keep = np.ones(len(df), dtype=bool)
+    for col, (lo, hi) in ranges.items():
+        values = df[col].to_numpy()
+        if lo is not None:
+            keep &= values >= lo
+        if hi is not None:
+            keep &= values <= hi
+    return np.flatnonzero(keep)
+
+
+def brute_similar(df, pos, k, candidates):
+    points = df[SCORE_COLUMNS].to_numpy(dtype=np.float64)
+    candidates = candidates[candidates != pos]
+    dist = np.linalg.norm(points[candidates] - points[pos], axis=1)
+    return np.sort(dist)[:k]
+
+
+def test_bounds_skip_missing_values():
+    engine = QueryEngine(pd.DataFrame({'median_income': pd.array([5, None, 2], dtype='Int32')}))
+    assert engine.bounds('median_income') == (2.0, 5.0)
+
+
+def test_bounds_of_constant_and_empty_columns():
+    engine = QueryEngine(pd.DataFrame({'population': [7, 7, 7],
+                                       'crime_rate': np.full(3, np.nan)}))
+    assert engine.bounds('population') == (7, 7)
+    assert engine.bounds('crime_rate') is None
+
+
+@pytest.mark.parametrize('ranges', [
+    {},
+    {'median_income': (60000, 120000)},
+    {'median_income': (60000, None), 'crime_rate': (None, 20.0), 'livability_score': (40.0, 80.0)},
+    {'population': (10**9, None)},
+])
+def test_filter_matches_a_scan(scored, ranges):
+    engine = QueryEngine(scored)
+    assert engine.filter(ranges).tolist() == brute_filter(scored, ranges).tolist()
+
+
+def test_best_matches_a_sort(scored):
+    engine = QueryEngine(scored)
+    positions = engine.filter({'median_income': (60000, 120000)})
+    best = engine.best(positions, 50)
+    values = scored['livability_score'].to_numpy()
+    assert values[best].tolist() == sorted(values[positions], reverse=True)[:50]
+
+
+@pytest.mark.parametrize('income', [None, (0, 150000), (60000, 120000), (150000, None)])
+def test_similar_matches_a_scan(scored, income):
+    index = SimilarityIndex(scored)
+    candidates = (np.arange(len(scored)) if income is None
+                  else brute_filter(scored, {'median_income': income}))
+    for pos in [0, 17, len(scored) // 2]:
+        shown, distances = index.similar(pos, 10, None if income is None else candidates)
+        assert pos not in shown and np.isin(shown, candidates).all()
+        np.testing.assert_allclose(distances, brute_similar(scored, pos, 10, candidates))
+
+
+def test_similar_skips_rows_with_missing_scores():
+    points = np.array([[0.0] * 5, [1.0] * 5, [np.nan, 1.0, 1.0, 1.0, 1.0], [3.0] * 5, [1.5] * 5])
+    index = SimilarityIndex(pd.DataFrame(points, columns=SCORE_COLUMNS))
+    shown, distances = index.similar(1, 10)
+    assert shown.tolist() == [4, 0, 3]
+    assert np.isfinite(distances).all()
+    assert index.similar(1, 10, np.array([0, 2, 3]))[0].tolist() == [0, 3]
+    assert not index.has_scores(2) and len(index.similar(2, 10)[0]) == 0
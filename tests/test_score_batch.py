@@ -0,0 +1,57 @@
+import argparse
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_dataset
+from datastore import read_csv
+from export import export_columns, plain_strings
+from interpretation import add_label_columns
+from score_batch import LABELED, main, parse_weights, score_chunks
+from scoring import DEFAULT_WEIGHTS, calculate_scores
+
+
+def test_parse_weights_rescales():
+    weights = parse_weights(['crime_score=0.75'])
+    assert sum(weights.values()) == pytest.approx(1)
+    assert weights['crime_score'] == pytest.approx(0.75 / 1.5)
+    assert parse_weights([]) == DEFAULT_WEIGHTS
+
+
+@pytest.mark.parametrize('pair', ['crime_score=abc', 'crime_score=-5', 'crime_score=nan',
+                                  'crime_score', 'walk_score=1'])
+def test_parse_weights_rejects_bad_pairs(pair):
+    with pytest.raises(argparse.ArgumentTypeError, match='Bad weight'):
+        parse_weights([pair])
+
+
+def test_colliding_outputs_are_refused(tmp_path):
+    for name in ['a', 'b']:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'zips.csv').write_text('zip_code\n01730\n')
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'a' / 'zips.csv'), str(tmp_path / 'b' / 'zips.csv'),
+              '-o', str(tmp_path / 'out')])
+    assert not (tmp_path / 'out').exists()
+
+
+@pytest.mark.parametrize('chunksize', [16, 37, 1000])
+def test_chunked_scoring_matches_whole_file(tmp_path, chunksize):
+    raw = make_dataset(300, seed=3)
+    raw.loc[5, 'median_income'] = None
+    path = tmp_path / 'zips.csv'
+    raw.to_csv(path, index=False)
+
+    weights = parse_weights(['crime_score=0.4', 'jobs_score=0.1'])
+    chunked = pd.concat(list(score_chunks(str(path), weights, chunksize)), ignore_index=True)
+    whole = add_label_columns(calculate_scores(read_csv(str(path)), weights), LABELED)
+    pd.testing.assert_frame_equal(chunked, plain_strings(whole[export_columns(whole)]))
+
+
+def test_batch_output_has_no_display_columns(tmp_path):
+    make_dataset(57).to_csv(tmp_path / 'zips.csv', index=False)
+    main([str(tmp_path / 'zips.csv'), '-o', str(tmp_path)])
+    columns = pd.read_csv(tmp_path / 'zips_scored.csv', nrows=1).columns
+    assert 'livability_score_label' in columns
+    assert not [col for col in columns
+                if col.endswith(('_color', '_emoji')) or col.startswith('map_')]
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from scoring import (METRIC_COLUMNS, NEUTRAL_SCORE, SCORE_COLUMNS, calculate_scores,
+                     normalize_metrics, rank_and_percentile, top_k)
+
+
+def scan_ranks(values):
+    """The per-value scans rank_and_percentile replaces."""
+    ranks = [int((values > v).sum()) + 1 for v in values]
+    pctiles = [int((values < v).mean() * 100) for v in values]
+    return ranks, pctiles
+
+
+def test_ties_rank_like_the_scans():
+    values = np.random.default_rng(0).integers(0, 20, 500).astype(np.float64)
+    ranks, pctiles = rank_and_percentile(values)
+    assert (ranks.tolist(), pctiles.tolist()) == scan_ranks(values)
+
+
+def test_ranking_part_of_a_column_against_all_of_it():
+    values = np.random.default_rng(1).integers(0, 20, 500).astype(np.float32)
+    ranks, pctiles = rank_and_percentile(values[100:200], np.sort(values))
+    expected_ranks, expected_pctiles = scan_ranks(values)
+    assert ranks.tolist() == expected_ranks[100:200]
+    assert pctiles.tolist() == expected_pctiles[100:200]
+
+
+def test_missing_values_rank_like_the_scans():
+    values = np.array([3.0, np.nan, 1.0, 3.0, 2.0])
+    ranks, pctiles = rank_and_percentile(values)
+    assert (ranks.tolist(), pctiles.tolist()) == scan_ranks(values)
+
+
+def test_constant_metric_scores_neutral():
+    metrics = np.array([[1.0, 5.0, 3.0, 2.0, 7.0],
+                        [2.0, 5.0, 4.0, 2.0, 9.0]])
+    scores = normalize_metrics(metrics)
+    assert not np.isnan(scores).any()
+    assert (scores[:, 1] == NEUTRAL_SCORE).all() and (scores[:, 3] == NEUTRAL_SCORE).all()
+    assert scores[:, 0].tolist() == [100.0, 0.0]
+
+
+def test_single_zip_region_is_scored():
+    row = {col: [1.0] for col in METRIC_COLUMNS + ['pct_bachelors_plus', 'mean_commute_time',
+                                                   'median_income']}
+    scored = calculate_scores(pd.DataFrame({'zip_code': ['01730'], **row}))
+    assert scored[SCORE_COLUMNS + ['livability_score']].iloc[0].tolist() == [NEUTRAL_SCORE] * 6
+    assert scored['livability_score_rank'].item() == 1
+
+
+def test_missing_metric_only_affects_its_row():
+    metrics = np.array([[1.0] * 5, [np.nan] * 5, [3.0] * 5])
+    scores = normalize_metrics(metrics)
+    assert np.isnan(scores[1]).all() and not np.isnan(scores[[0, 2]]).any()
+
+
+def test_top_k_puts_missing_values_last():
+    values = np.array([np.nan, 2.0, np.nan, 5.0, 1.0])
+    assert top_k(values, 3).tolist() == [3, 1, 4]
+    assert top_k(values, 3, largest=False).tolist() == [4, 1, 3]
+    assert top_k(values, 5).tolist() == [3, 1, 4, 0, 2]
+    assert top_k(np.full(3, np.nan), 1).tolist() == [0]